@@ -1,567 +1,1120 @@
-import os
-import sys
-import json
-import tempfile
-import base64
-import speech_recognition as sr
-from flask import Flask, request, jsonify, send_from_directory
-from flask_cors import CORS
-import nltk
-from nltk.tokenize import sent_tokenize
-import re
-from pydub import AudioSegment
-import io
-import random
-import string
-from database import Database
-from gpt_analyzer import GPTAnalyzer
-from fact_checker import FactChecker
-
-# Download required NLTK data
-print("Initializing NLTK...")
-try:
-    nltk.data.find('tokenizers/punkt')
-    print("NLTK punkt tokenizer already downloaded.")
-except LookupError:
-    print("Downloading NLTK punkt tokenizer...")
-    try:
-        nltk.download('punkt', quiet=True)
-        print("NLTK punkt tokenizer downloaded successfully.")
-    except Exception as e:
-        print(f"Error downloading NLTK punkt tokenizer: {str(e)}")
-        print("The application may not function correctly without the punkt tokenizer.")
-
-# Add the frontend directory to the path so we can import our VoiceToText class
-sys.path.append(os.path.join(os.path.dirname(__file__), 'frontend'))
-from voice_to_text import VoiceToText
-
-# Download required NLTK data
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
-
-app = Flask(__name__, static_folder='../frontend/public', static_url_path='')
-CORS(app, resources={r"/*": {"origins": "*"}})
-
-# Initialize the VoiceToText converter
-vtt = VoiceToText()
-
-# Initialize database and GPT analyzer
-db = Database()
-gpt_analyzer = GPTAnalyzer()
-
-# Import our new fact checker
-fact_checker = FactChecker()
-
-# Sample fact database - in a real application, this would be a comprehensive database
-FACT_DATABASE = {
-    "climate change": {
-        "facts": [
-            "The Earth's average temperature has increased by approximately 1.1°C since the pre-industrial era.",
-            "The concentration of CO2 in the atmosphere has increased from about 280 ppm in 1750 to over 400 ppm today.",
-            "The Arctic is warming at twice the global average rate.",
-            "Global sea levels have risen by about 8 inches since 1900.",
-            "The last seven years have been the warmest on record.",
-            "Extreme weather events have become more frequent and intense due to climate change."
-        ],
-        "sources": ["IPCC", "NASA", "NOAA", "World Meteorological Organization"],
-        "counter_arguments": [
-            "Climate change is a natural cycle and not caused by human activities.",
-            "The Earth has been warmer in the past, so current warming is not concerning.",
-            "Climate models are unreliable and exaggerate future warming.",
-            "CO2 is a plant food and more of it is beneficial for agriculture."
-        ]
-    },
-    "vaccination": {
-        "facts": [
-            "Vaccines have eradicated smallpox and nearly eliminated polio worldwide.",
-            "Vaccines undergo rigorous safety testing before approval for public use.",
-            "Herd immunity requires a high percentage of the population to be vaccinated.",
-            "Vaccines do not cause autism - this claim was based on a fraudulent study.",
-            "The benefits of vaccination far outweigh the risks of side effects.",
-            "Vaccines contain only trace amounts of preservatives like thimerosal."
-        ],
-        "sources": ["WHO", "CDC", "NIH", "American Academy of Pediatrics"],
-        "counter_arguments": [
-            "Vaccines cause autism and other developmental disorders.",
-            "Vaccines contain dangerous levels of mercury and other toxins.",
-            "Natural immunity is better than vaccine-induced immunity.",
-            "Vaccines are part of a conspiracy to control the population."
-        ]
-    },
-    "covid-19": {
-        "facts": [
-            "COVID-19 is caused by the SARS-CoV-2 virus.",
-            "The virus primarily spreads through respiratory droplets.",
-            "Multiple effective vaccines have been developed against COVID-19.",
-            "Face masks help reduce the spread of the virus when worn correctly.",
-            "COVID-19 is more severe than seasonal influenza for many people.",
-            "Asymptomatic people can still spread the virus to others."
-        ],
-        "sources": ["WHO", "CDC", "NIH", "European Centre for Disease Prevention and Control"],
-        "counter_arguments": [
-            "COVID-19 is no worse than the flu.",
-            "The virus was created in a laboratory as a bioweapon.",
-            "Face masks don't work and can cause health problems.",
-            "The vaccines were developed too quickly and are unsafe."
-        ]
-    },
-    "democracy": {
-        "facts": [
-            "India is the world's largest democracy with over 900 million eligible voters.",
-            "The first democratic elections in India were held in 1951-52.",
-            "The Indian Constitution guarantees universal adult suffrage.",
-            "India has a multi-party system with regular elections at various levels.",
-            "The Election Commission of India is responsible for conducting free and fair elections.",
-            "India has successfully conducted elections even during the COVID-19 pandemic."
-        ],
-        "sources": ["Election Commission of India", "Constitution of India", "International Institute for Democracy and Electoral Assistance"],
-        "counter_arguments": [
-            "India's democracy is flawed due to money power and criminalization of politics.",
-            "Electoral reforms are needed to make Indian democracy more representative.",
-            "Voter turnout in India has been declining in recent years.",
-            "The first-past-the-post system leads to disproportionate representation."
-        ]
-    },
-    "education": {
-        "facts": [
-            "India has one of the largest higher education systems in the world.",
-            "The Right to Education Act (RTE) was passed in 2009.",
-            "India has over 1000 universities and 40,000 colleges.",
-            "The National Education Policy 2020 aims to transform India's education system.",
-            "India produces the largest number of STEM graduates globally.",
-            "The literacy rate in India has increased from 18.33% in 1951 to 77.7% in 2018."
-        ],
-        "sources": ["MHRD", "UGC", "NEP 2020", "UNESCO"],
-        "counter_arguments": [
-            "The quality of education in India is declining despite increased enrollment.",
-            "There is a significant digital divide in access to online education.",
-            "Rote learning is still prevalent in Indian education system.",
-            "Higher education in India is not aligned with industry requirements."
-        ]
-    },
-    "economy": {
-        "facts": [
-            "India is the world's fifth-largest economy by nominal GDP.",
-            "India's GDP growth rate averaged around 7% from 2014 to 2019.",
-            "The service sector contributes the largest share to India's GDP.",
-            "India has implemented significant economic reforms since 1991.",
-            "India is one of the fastest-growing major economies in the world.",
-            "The Indian government has launched several initiatives to promote entrepreneurship and innovation."
-        ],
-        "sources": ["World Bank", "IMF", "Reserve Bank of India", "Ministry of Finance"],
-        "counter_arguments": [
-            "India's economic growth has slowed down in recent years.",
-            "Income inequality has increased in India despite economic growth.",
-            "The informal sector employs a large portion of India's workforce.",
-            "India faces challenges in creating enough jobs for its growing workforce."
-        ]
-    },
-    "technology": {
-        "facts": [
-            "India is one of the largest IT services exporters in the world.",
-            "India has the second-largest number of internet users globally.",
-            "The Indian government has launched the Digital India initiative.",
-            "India has one of the lowest data costs in the world.",
-            "India is a major hub for software development and IT services.",
-            "The Indian startup ecosystem has grown significantly in recent years."
-        ],
-        "sources": ["NASSCOM", "Ministry of Electronics and Information Technology", "World Bank", "GSMA"],
-        "counter_arguments": [
-            "Digital divide persists in India, especially in rural areas.",
-            "India's technology sector is dependent on foreign markets.",
-            "Cybersecurity concerns are growing with increased digital adoption.",
-            "India lacks sufficient investment in research and development."
-        ]
-    }
-}
-
-# Keywords that often indicate a claim
-CLAIM_INDICATORS = [
-    'is', 'are', 'was', 'were', 'should', 'must', 'need', 'always', 'never', 
-    'every', 'all', 'none', 'fact', 'prove', 'evidence', 'study', 'research', 
-    'data', 'statistics', 'shows', 'demonstrates', 'indicates', 'suggests',
-    'concludes', 'finds', 'reveals', 'claims', 'asserts', 'maintains', 'argues',
-    'contends', 'believes', 'thinks', 'says', 'states', 'declares', 'announces',
-    'reports', 'according to', 'based on', 'according to research', 'studies show',
-    'experts say', 'scientists say', 'research shows', 'data shows', 'evidence shows'
-]
-
-def extract_claims(text):
-    """
-    Extract claims from text using NLTK for sentence tokenization and
-    pattern matching for claim identification.
-    """
-    # Tokenize the text into sentences
-    sentences = sent_tokenize(text)
-    claims = []
-    
-    for sentence in sentences:
-        # Skip very short sentences
-        if len(sentence.split()) < 3:
-            continue
-            
-        # Check if the sentence contains claim indicators
-        sentence_lower = sentence.lower()
-        if any(indicator in sentence_lower for indicator in CLAIM_INDICATORS):
-            claims.append(sentence.strip())
-            
-    return claims
-
-def calculate_claim_percentages(claims):
-    """
-    Calculate the percentage of claims found in the text.
-    """
-    total_claims = len(claims)
-    if total_claims == 0:
-        return []
-    
-    percentages = []
-    for i, claim in enumerate(claims):
-        percentage = ((i + 1) / total_claims) * 100
-        percentages.append({
-            'claim': claim,
-            'percentage': round(percentage, 2)
-        })
-    return percentages
-
-def find_relevant_facts(claim, topic):
-    """
-    Find facts from the database that are relevant to the claim.
-    """
-    if topic not in FACT_DATABASE:
-        return []
-        
-    facts = FACT_DATABASE[topic]["facts"]
-    claim_lower = claim.lower()
-    
-    # Simple relevance scoring based on word overlap
-    relevant_facts = []
-    for fact in facts:
-        fact_lower = fact.lower()
-        # Count common words between claim and fact
-        claim_words = set(claim_lower.split())
-        fact_words = set(fact_lower.split())
-        common_words = claim_words.intersection(fact_words)
-        
-        # If there's significant overlap, consider the fact relevant
-        if len(common_words) >= 3:
-            relevant_facts.append(fact)
-            
-    return relevant_facts
-
-def find_counter_arguments(claim, topic):
-    """
-    Find counter arguments from the database that are relevant to the claim.
-    """
-    if topic not in FACT_DATABASE or "counter_arguments" not in FACT_DATABASE[topic]:
-        return []
-        
-    counter_args = FACT_DATABASE[topic]["counter_arguments"]
-    claim_lower = claim.lower()
-    
-    # Find counter arguments that directly contradict the claim
-    relevant_counter_args = []
-    for arg in counter_args:
-        arg_lower = arg.lower()
-        # Check for contradiction indicators
-        if any(word in claim_lower and word in arg_lower for word in ["is", "are", "was", "were"]):
-            relevant_counter_args.append(arg)
-            
-    return relevant_counter_args
-
-def generate_reason(claim, verification_status, relevant_facts, counter_arguments, topic):
-    """
-    Generate a detailed reason for the verification status.
-    """
-    if verification_status == "true":
-        if relevant_facts:
-            return f"This claim is TRUE. {relevant_facts[0]} Additionally, {relevant_facts[1] if len(relevant_facts) > 1 else 'scientific evidence supports this statement.'}"
-        else:
-            return f"This claim about {topic} appears to be TRUE based on available information, though specific supporting facts are not found in our database."
-    
-    elif verification_status == "false":
-        if counter_arguments:
-            return f"This claim is FALSE. {counter_arguments[0]} In fact, {relevant_facts[0] if relevant_facts else 'available evidence contradicts this statement.'}"
-        else:
-            return f"This claim about {topic} appears to be FALSE based on available information, though specific contradicting facts are not found in our database."
-    
-    elif verification_status == "partially true":
-        if relevant_facts and counter_arguments:
-            return f"This claim is PARTIALLY TRUE. While {relevant_facts[0]}, it's important to note that {counter_arguments[0]}"
-        else:
-            return f"This claim about {topic} is PARTIALLY TRUE. It contains some accurate information but also includes inaccuracies or oversimplifications."
-    
-    elif verification_status == "misleading":
-        if counter_arguments:
-            return f"This claim is MISLEADING. {counter_arguments[0]} The claim presents a distorted or incomplete view of the facts."
-        else:
-            return f"This claim about {topic} is MISLEADING. It presents information in a way that could lead to incorrect conclusions."
-    
-    else:  # unknown
-        return f"We cannot verify this claim about {topic} with sufficient confidence. More information or context would be needed to determine its accuracy."
-
-def verify_claim(claim):
-    """
-    Verify a claim against the fact database and generate a detailed response.
-    """
-    # Use our new fact checker for real-world verification
-    return fact_checker.verify_claim(claim)
-
-@app.route('/')
-def home():
-    return send_from_directory(app.static_folder, 'index.html')
-
-@app.route('/test_fact_checker.html')
-def test_fact_checker():
-    return send_from_directory(app.static_folder, 'test_fact_checker.html')
-
-@app.route('/test.html')
-def test():
-    return send_from_directory(app.static_folder, 'test.html')
-
-@app.route('/api/analyze/claims', methods=['POST'])
-def analyze_claims():
-    try:
-        data = request.get_json()
-        if not data or 'text' not in data:
-            return jsonify({"error": "No text provided"}), 400
-            
-        text = data['text']
-        print(f"Received text for analysis: {text[:100]}...")  # Debug log
-        
-        # Extract claims and calculate percentages
-        try:
-            claims = extract_claims(text)
-            print(f"Extracted {len(claims)} claims")  # Debug log
-            if not claims:
-                print("No claims were extracted from the text")
-                return jsonify({
-                    'claims': [],
-                    'total_claims': 0,
-                    'message': 'No claims were found in the provided text.'
-                })
-        except Exception as e:
-            import traceback
-            print(f"Error extracting claims: {str(e)}")
-            print(traceback.format_exc())  # Print full traceback
-            return jsonify({"error": f"Error extracting claims: {str(e)}"}), 500
-            
-        try:
-            claim_percentages = calculate_claim_percentages(claims)
-            print(f"Calculated claim percentages: {claim_percentages}")  # Debug log
-        except Exception as e:
-            import traceback
-            print(f"Error calculating claim percentages: {str(e)}")
-            print(traceback.format_exc())  # Print full traceback
-            return jsonify({"error": f"Error calculating claim percentages: {str(e)}"}), 500
-        
-        # Verify each claim
-        verified_claims = []
-        for claim_data in claim_percentages:
-            try:
-                claim = claim_data['claim']
-                verification = fact_checker.verify_claim(claim)
-                
-                verified_claims.append({
-                    'claim': claim,
-                    'percentage': claim_data['percentage'],
-                    'verification': verification
-                })
-            except Exception as e:
-                import traceback
-                print(f"Error verifying claim '{claim}': {str(e)}")
-                print(traceback.format_exc())  # Print full traceback
-                verified_claims.append({
-                    'claim': claim,
-                    'percentage': claim_data['percentage'],
-                    'verification': {
-                        "verified": "error",
-                        "confidence": 0,
-                        "explanation": f"Error during verification: {str(e)}",
-                        "related_facts": [],
-                        "sources": [],
-                        "counter_arguments": [],
-                        "reason": "An error occurred during verification."
-                    }
-                })
-        
-        return jsonify({
-            'claims': verified_claims,
-            'total_claims': len(claims)
-        })
-    except Exception as e:
-        import traceback
-        print(f"Error in analyze_claims: {str(e)}")
-        print(traceback.format_exc())  # Print full traceback
-        return jsonify({"error": str(e)}), 500
-
-@app.route('/api/microphones', methods=['GET'])
-def get_microphones():
-    """Get a list of available microphones."""
-    microphones = vtt.list_microphones()
-    return jsonify(microphones)
-
-@app.route('/api/voice-to-text', methods=['POST'])
-def voice_to_text():
-    temp_file = None
-    try:
-        if 'audio' not in request.files:
-            return jsonify({"error": "No audio file provided"}), 400
-
-        audio_file = request.files['audio']
-        
-        # Create a temporary file with a .wav extension
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
-        temp_path = temp_file.name
-        temp_file.close()
-        
-        # Save the uploaded file
-        audio_file.save(temp_path)
-        
-        # Process the audio file using our VoiceToText class
-        recognizer = sr.Recognizer()
-        with sr.AudioFile(temp_path) as source:
-            # Adjust for ambient noise
-            recognizer.adjust_for_ambient_noise(source, duration=0.5)
-            # Record the audio
-            audio_data = recognizer.record(source)
-            
-            # Try to recognize the speech
-            result = {
-                "success": False,
-                "text": None,
-                "error": None
-            }
-            
-            # Try Google's service first
-            try:
-                text = recognizer.recognize_google(audio_data, language="en-US")
-                result["success"] = True
-                result["text"] = text
-                result["service"] = "google"
-            except sr.UnknownValueError:
-                result["error"] = "Speech recognition could not understand the audio. Please speak more clearly."
-            except sr.RequestError as e:
-                result["error"] = f"Google Speech Recognition service error: {e}"
-                
-            # If Google fails and Sphinx is available, try Sphinx (offline recognition)
-            if not result["success"] and hasattr(vtt, 'SPHINX_AVAILABLE') and vtt.SPHINX_AVAILABLE:
-                try:
-                    text = recognizer.recognize_sphinx(audio_data)
-                    result["success"] = True
-                    result["text"] = text
-                    result["service"] = "sphinx"
-                except Exception as e:
-                    result["error"] = f"Sphinx recognition failed: {e}"
-            
-            if result["success"]:
-                return jsonify(result)
-            else:
-                return jsonify({"error": result["error"]}), 400
-            
-    except Exception as e:
-        return jsonify({"error": f"Error processing audio: {str(e)}"}), 500
-    finally:
-        # Clean up the temporary file
-        if temp_file and os.path.exists(temp_path):
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
-
-@app.route('/api/analyze', methods=['POST'])
-def analyze_text():
-    """Analyze text using GPT and store results in database."""
-    try:
-        data = request.json
-        text = data.get('text')
-        analysis_type = data.get('analysis_type', 'general')
-        
-        if not text:
-            return jsonify({"error": "No text provided"}), 400
-        
-        # Analyze text using GPT
-        analysis_result = gpt_analyzer.analyze_text(text, analysis_type)
-        
-        if analysis_result['success']:
-            # Save to database
-            analysis_id = db.save_analysis(
-                text=text,
-                analysis_type=analysis_type,
-                results=analysis_result['results'],
-                source='gpt-4',
-                confidence_score=analysis_result.get('confidence_score')
-            )
-            
-            # Add database ID to response
-            analysis_result['analysis_id'] = analysis_id
-            
-            return jsonify(analysis_result)
-        else:
-            return jsonify({"error": analysis_result['error']}), 500
-            
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-@app.route('/api/verify-claim', methods=['POST'])
-def verify_claim_endpoint():
-    """Verify a specific claim using GPT."""
-    try:
-        data = request.json
-        claim = data.get('claim')
-        
-        if not claim:
-            return jsonify({"error": "No claim provided"}), 400
-        
-        # Verify claim using GPT
-        verification_result = gpt_analyzer.verify_claim(claim)
-        
-        if verification_result['success']:
-            # Save to database
-            analysis_id = db.save_analysis(
-                text=claim,
-                analysis_type='claim_verification',
-                results=verification_result['verification'],
-                source='gpt-4',
-                confidence_score=verification_result['verification'].get('confidence_score')
-            )
-            
-            # Add database ID to response
-            verification_result['analysis_id'] = analysis_id
-            
-            return jsonify(verification_result)
-        else:
-            return jsonify({"error": verification_result['error']}), 500
-            
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-@app.route('/api/analysis/<int:analysis_id>', methods=['GET'])
-def get_analysis(analysis_id):
-    """Retrieve a specific analysis by ID."""
-    try:
-        analysis = db.get_analysis(analysis_id)
-        
-        if analysis:
-            return jsonify(analysis)
-        else:
-            return jsonify({"error": "Analysis not found"}), 404
-            
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-@app.route('/api/recent-analyses', methods=['GET'])
-def get_recent_analyses():
-    """Get recent analyses."""
-    try:
-        limit = request.args.get('limit', default=10, type=int)
-        analyses = db.get_recent_analyses(limit)
-        return jsonify(analyses)
-        
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-
-if __name__ == '__main__':
+import os
+import sys
+import atexit
+import json
+import tempfile
+import base64
+import speech_recognition as sr
+from flask import Flask, Response, request, jsonify, send_from_directory, stream_with_context
+from flask_cors import CORS
+import nltk
+import re
+from pydub import AudioSegment
+import io
+import random
+import string
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from flask.json import JSONEncoder
+from database import Database, LazyResults, ndjson_line
+from gpt_analyzer import GPTAnalyzer
+from fact_checker import FactChecker, KNOWN_FACTS, register_fact_index
+from fact_index import FactIndex
+from claim_cache import ClaimResultCache
+from claim_detector import ClaimDetector, DEFAULT_MIN_STRENGTH
+
+# Download required NLTK data
+print("Initializing NLTK...")
+try:
+    nltk.data.find('tokenizers/punkt')
+    print("NLTK punkt tokenizer already downloaded.")
+except LookupError:
+    print("Downloading NLTK punkt tokenizer...")
+    try:
+        nltk.download('punkt', quiet=True)
+        print("NLTK punkt tokenizer downloaded successfully.")
+    except Exception as e:
+        print(f"Error downloading NLTK punkt tokenizer: {str(e)}")
+        print("The application may not function correctly without the punkt tokenizer.")
+
+# Add the frontend directory to the path so we can import our VoiceToText class
+sys.path.append(os.path.join(os.path.dirname(__file__), 'frontend'))
+from voice_to_text import VoiceToText
+
+# Download required NLTK data
+try:
+    nltk.data.find('corpora/stopwords')
+except LookupError:
+    nltk.download('stopwords')
+
+class DebateSphereJSONEncoder(JSONEncoder):
+    """JSON encoder that decodes lazily loaded analysis results on serialization."""
+    def default(self, o):
+        if isinstance(o, LazyResults):
+            return o.decoded()
+        return super().default(o)
+
+app = Flask(__name__, static_folder='../frontend/public', static_url_path='')
+app.json_encoder = DebateSphereJSONEncoder
+CORS(app, resources={r"/*": {"origins": "*"}})
+
+# Initialize the VoiceToText converter
+vtt = VoiceToText()
+
+# Initialize database and GPT analyzer
+db = Database(
+    write_behind=os.environ.get('DB_WRITE_BEHIND', '').lower() in ('1', 'true', 'yes'),
+    batch_size=int(os.environ.get('DB_WRITE_BATCH_SIZE', 100)),
+    flush_interval_ms=int(os.environ.get('DB_WRITE_FLUSH_MS', 50)),
+    archive_dir=os.environ.get('DB_ARCHIVE_DIR'),
+    pool_size=int(os.environ.get('DB_POOL_SIZE', 8)),
+    pool_timeout=float(os.environ.get('DB_POOL_TIMEOUT', 30))
+)
+# Drain any queued write-behind rows before the process exits
+atexit.register(db.close)
+gpt_analyzer = GPTAnalyzer(
+    cache_path=os.environ.get('GPT_CACHE_PATH', 'gpt_cache.db') or None,
+    cache_ttl=float(os.environ.get('GPT_CACHE_TTL', 24 * 3600)),
+    cache_max_entries=int(os.environ.get('GPT_CACHE_SIZE', 20000)),
+    async_client=os.environ.get('GPT_ASYNC_CLIENT', '').lower() in ('1', 'true', 'yes'),
+    max_concurrency=int(os.environ.get('GPT_MAX_CONCURRENCY', 8)),
+    requests_per_minute=float(os.environ.get('GPT_REQUESTS_PER_MINUTE', 60)),
+    tokens_per_minute=float(os.environ.get('GPT_TOKENS_PER_MINUTE', 40000)),
+    chunk_tokens=int(os.environ.get('GPT_CHUNK_TOKENS', 2000)),
+    max_chunk_workers=int(os.environ.get('GPT_CHUNK_WORKERS', 4))
+)
+atexit.register(gpt_analyzer.close)
+
+# Import our new fact checker
+fact_checker = FactChecker(
+    wikipedia_backend=os.environ.get('WIKIPEDIA_BACKEND', 'remote'),
+    wiki_index_path=os.environ.get('WIKIPEDIA_INDEX_PATH')
+)
+
+# Claim verification concurrency settings (overridable per request)
+CLAIM_VERIFICATION_WORKERS = int(os.environ.get('CLAIM_VERIFICATION_WORKERS', 8))
+CLAIM_VERIFICATION_TIMEOUT = float(os.environ.get('CLAIM_VERIFICATION_TIMEOUT', 30))
+
+# Recently verified claims, keyed on a normalized fingerprint of the claim text
+CLAIM_CACHE_TTL = float(os.environ.get('CLAIM_CACHE_TTL', 600))
+CLAIM_CACHE_SIZE = int(os.environ.get('CLAIM_CACHE_SIZE', 10000))
+fact_check_cache = ClaimResultCache(ttl=CLAIM_CACHE_TTL, max_entries=CLAIM_CACHE_SIZE)
+gpt_claim_cache = ClaimResultCache(ttl=CLAIM_CACHE_TTL, max_entries=CLAIM_CACHE_SIZE)
+
+# Verdicts stored in the database younger than this many seconds are reused
+# instead of verifying the claim again (0 disables reuse)
+CLAIM_VERDICT_MAX_AGE = float(os.environ.get('CLAIM_VERDICT_MAX_AGE', 86400))
+
+# Claims packed into one batched GPT verification request, and the most
+# claims one /api/verify-claim request may carry
+GPT_VERIFY_BATCH_SIZE = int(os.environ.get('GPT_VERIFY_BATCH_SIZE', 10))
+MAX_VERIFY_CLAIMS = int(os.environ.get('MAX_VERIFY_CLAIMS', 100))
+
+# Sample fact database - in a real application, this would be a comprehensive database
+FACT_DATABASE = {
+    "climate change": {
+        "facts": [
+            "The Earth's average temperature has increased by approximately 1.1°C since the pre-industrial era.",
+            "The concentration of CO2 in the atmosphere has increased from about 280 ppm in 1750 to over 400 ppm today.",
+            "The Arctic is warming at twice the global average rate.",
+            "Global sea levels have risen by about 8 inches since 1900.",
+            "The last seven years have been the warmest on record.",
+            "Extreme weather events have become more frequent and intense due to climate change."
+        ],
+        "sources": ["IPCC", "NASA", "NOAA", "World Meteorological Organization"],
+        "counter_arguments": [
+            "Climate change is a natural cycle and not caused by human activities.",
+            "The Earth has been warmer in the past, so current warming is not concerning.",
+            "Climate models are unreliable and exaggerate future warming.",
+            "CO2 is a plant food and more of it is beneficial for agriculture."
+        ]
+    },
+    "vaccination": {
+        "facts": [
+            "Vaccines have eradicated smallpox and nearly eliminated polio worldwide.",
+            "Vaccines undergo rigorous safety testing before approval for public use.",
+            "Herd immunity requires a high percentage of the population to be vaccinated.",
+            "Vaccines do not cause autism - this claim was based on a fraudulent study.",
+            "The benefits of vaccination far outweigh the risks of side effects.",
+            "Vaccines contain only trace amounts of preservatives like thimerosal."
+        ],
+        "sources": ["WHO", "CDC", "NIH", "American Academy of Pediatrics"],
+        "counter_arguments": [
+            "Vaccines cause autism and other developmental disorders.",
+            "Vaccines contain dangerous levels of mercury and other toxins.",
+            "Natural immunity is better than vaccine-induced immunity.",
+            "Vaccines are part of a conspiracy to control the population."
+        ]
+    },
+    "covid-19": {
+        "facts": [
+            "COVID-19 is caused by the SARS-CoV-2 virus.",
+            "The virus primarily spreads through respiratory droplets.",
+            "Multiple effective vaccines have been developed against COVID-19.",
+            "Face masks help reduce the spread of the virus when worn correctly.",
+            "COVID-19 is more severe than seasonal influenza for many people.",
+            "Asymptomatic people can still spread the virus to others."
+        ],
+        "sources": ["WHO", "CDC", "NIH", "European Centre for Disease Prevention and Control"],
+        "counter_arguments": [
+            "COVID-19 is no worse than the flu.",
+            "The virus was created in a laboratory as a bioweapon.",
+            "Face masks don't work and can cause health problems.",
+            "The vaccines were developed too quickly and are unsafe."
+        ]
+    },
+    "democracy": {
+        "facts": [
+            "India is the world's largest democracy with over 900 million eligible voters.",
+            "The first democratic elections in India were held in 1951-52.",
+            "The Indian Constitution guarantees universal adult suffrage.",
+            "India has a multi-party system with regular elections at various levels.",
+            "The Election Commission of India is responsible for conducting free and fair elections.",
+            "India has successfully conducted elections even during the COVID-19 pandemic."
+        ],
+        "sources": ["Election Commission of India", "Constitution of India", "International Institute for Democracy and Electoral Assistance"],
+        "counter_arguments": [
+            "India's democracy is flawed due to money power and criminalization of politics.",
+            "Electoral reforms are needed to make Indian democracy more representative.",
+            "Voter turnout in India has been declining in recent years.",
+            "The first-past-the-post system leads to disproportionate representation."
+        ]
+    },
+    "education": {
+        "facts": [
+            "India has one of the largest higher education systems in the world.",
+            "The Right to Education Act (RTE) was passed in 2009.",
+            "India has over 1000 universities and 40,000 colleges.",
+            "The National Education Policy 2020 aims to transform India's education system.",
+            "India produces the largest number of STEM graduates globally.",
+            "The literacy rate in India has increased from 18.33% in 1951 to 77.7% in 2018."
+        ],
+        "sources": ["MHRD", "UGC", "NEP 2020", "UNESCO"],
+        "counter_arguments": [
+            "The quality of education in India is declining despite increased enrollment.",
+            "There is a significant digital divide in access to online education.",
+            "Rote learning is still prevalent in Indian education system.",
+            "Higher education in India is not aligned with industry requirements."
+        ]
+    },
+    "economy": {
+        "facts": [
+            "India is the world's fifth-largest economy by nominal GDP.",
+            "India's GDP growth rate averaged around 7% from 2014 to 2019.",
+            "The service sector contributes the largest share to India's GDP.",
+            "India has implemented significant economic reforms since 1991.",
+            "India is one of the fastest-growing major economies in the world.",
+            "The Indian government has launched several initiatives to promote entrepreneurship and innovation."
+        ],
+        "sources": ["World Bank", "IMF", "Reserve Bank of India", "Ministry of Finance"],
+        "counter_arguments": [
+            "India's economic growth has slowed down in recent years.",
+            "Income inequality has increased in India despite economic growth.",
+            "The informal sector employs a large portion of India's workforce.",
+            "India faces challenges in creating enough jobs for its growing workforce."
+        ]
+    },
+    "technology": {
+        "facts": [
+            "India is one of the largest IT services exporters in the world.",
+            "India has the second-largest number of internet users globally.",
+            "The Indian government has launched the Digital India initiative.",
+            "India has one of the lowest data costs in the world.",
+            "India is a major hub for software development and IT services.",
+            "The Indian startup ecosystem has grown significantly in recent years."
+        ],
+        "sources": ["NASSCOM", "Ministry of Electronics and Information Technology", "World Bank", "GSMA"],
+        "counter_arguments": [
+            "Digital divide persists in India, especially in rural areas.",
+            "India's technology sector is dependent on foreign markets.",
+            "Cybersecurity concerns are growing with increased digital adoption.",
+            "India lacks sufficient investment in research and development."
+        ]
+    }
+}
+
+# Inverted index over all known facts, built once and extended by add_fact
+# and fact_checker.add_known_topic
+fact_index = FactIndex()
+fact_index.add_facts_table(FACT_DATABASE)
+register_fact_index(fact_index)
+
+# Minimum BM25 score for a fact to count as relevant to a claim
+FACT_RELEVANCE_THRESHOLD = float(os.environ.get('FACT_RELEVANCE_THRESHOLD', 3.0))
+
+# Keywords that often indicate a claim
+CLAIM_INDICATORS = [
+    'is', 'are', 'was', 'were', 'should', 'must', 'need', 'always', 'never', 
+    'every', 'all', 'none', 'fact', 'prove', 'evidence', 'study', 'research', 
+    'data', 'statistics', 'shows', 'demonstrates', 'indicates', 'suggests',
+    'concludes', 'finds', 'reveals', 'claims', 'asserts', 'maintains', 'argues',
+    'contends', 'believes', 'thinks', 'says', 'states', 'declares', 'announces',
+    'reports', 'according to', 'based on', 'according to research', 'studies show',
+    'experts say', 'scientists say', 'research shows', 'data shows', 'evidence shows'
+]
+
+# Compiled once: matches indicators on word boundaries in a single pass per sentence
+CLAIM_MIN_STRENGTH = float(os.environ.get('CLAIM_MIN_STRENGTH', DEFAULT_MIN_STRENGTH))
+claim_detector = ClaimDetector(CLAIM_INDICATORS, min_strength=CLAIM_MIN_STRENGTH)
+
+def extract_claims(text):
+    """
+    Extract claims from text using NLTK for sentence tokenization and
+    pattern matching for claim identification.
+    """
+    return [claim['claim'] for claim in claim_detector.extract(text)]
+
+def extract_claims_batch(texts):
+    """
+    Extract claims from many documents at once. Each claim comes with the
+    indicators that fired and its claim-strength score.
+    """
+    return claim_detector.extract_batch(texts)
+
+def calculate_claim_percentages(claims):
+    """
+    Calculate the percentage of claims found in the text.
+    """
+    total_claims = len(claims)
+    if total_claims == 0:
+        return []
+    
+    percentages = []
+    for i, claim in enumerate(claims):
+        percentage = ((i + 1) / total_claims) * 100
+        percentages.append({
+            'claim': claim,
+            'percentage': round(percentage, 2)
+        })
+    return percentages
+
+def add_fact(topic, fact):
+    """
+    Add a fact to the fact database and index it for retrieval.
+    """
+    topic_data = FACT_DATABASE.setdefault(topic, {"facts": [], "sources": [], "counter_arguments": []})
+    if fact not in topic_data["facts"]:
+        topic_data["facts"].append(fact)
+    fact_index.add_fact(topic, fact)
+
+def search_facts(claim, topic=None, k=5, min_score=0.0):
+    """
+    Rank facts by BM25 relevance to the claim, across all topics unless one is given.
+    Returns dictionaries with the fact, its topic and its score.
+    """
+    return fact_index.search(claim, k=k, topic=topic, min_score=min_score)
+
+def find_relevant_facts(claim, topic=None, k=5, min_score=FACT_RELEVANCE_THRESHOLD):
+    """
+    Find facts from the database that are relevant to the claim.
+    """
+    if topic is not None and topic not in FACT_DATABASE and topic not in KNOWN_FACTS:
+        return []
+    
+    return [result["fact"] for result in search_facts(claim, topic, k, min_score)]
+
+def find_counter_arguments(claim, topic):
+    """
+    Find counter arguments from the database that are relevant to the claim.
+    """
+    if topic not in FACT_DATABASE or "counter_arguments" not in FACT_DATABASE[topic]:
+        return []
+        
+    counter_args = FACT_DATABASE[topic]["counter_arguments"]
+    claim_lower = claim.lower()
+    
+    # Find counter arguments that directly contradict the claim
+    relevant_counter_args = []
+    for arg in counter_args:
+        arg_lower = arg.lower()
+        # Check for contradiction indicators
+        if any(word in claim_lower and word in arg_lower for word in ["is", "are", "was", "were"]):
+            relevant_counter_args.append(arg)
+            
+    return relevant_counter_args
+
+def generate_reason(claim, verification_status, relevant_facts, counter_arguments, topic):
+    """
+    Generate a detailed reason for the verification status.
+    """
+    if verification_status == "true":
+        if relevant_facts:
+            return f"This claim is TRUE. {relevant_facts[0]} Additionally, {relevant_facts[1] if len(relevant_facts) > 1 else 'scientific evidence supports this statement.'}"
+        else:
+            return f"This claim about {topic} appears to be TRUE based on available information, though specific supporting facts are not found in our database."
+    
+    elif verification_status == "false":
+        if counter_arguments:
+            return f"This claim is FALSE. {counter_arguments[0]} In fact, {relevant_facts[0] if relevant_facts else 'available evidence contradicts this statement.'}"
+        else:
+            return f"This claim about {topic} appears to be FALSE based on available information, though specific contradicting facts are not found in our database."
+    
+    elif verification_status == "partially true":
+        if relevant_facts and counter_arguments:
+            return f"This claim is PARTIALLY TRUE. While {relevant_facts[0]}, it's important to note that {counter_arguments[0]}"
+        else:
+            return f"This claim about {topic} is PARTIALLY TRUE. It contains some accurate information but also includes inaccuracies or oversimplifications."
+    
+    elif verification_status == "misleading":
+        if counter_arguments:
+            return f"This claim is MISLEADING. {counter_arguments[0]} The claim presents a distorted or incomplete view of the facts."
+        else:
+            return f"This claim about {topic} is MISLEADING. It presents information in a way that could lead to incorrect conclusions."
+    
+    else:  # unknown
+        return f"We cannot verify this claim about {topic} with sufficient confidence. More information or context would be needed to determine its accuracy."
+
+def is_complete_verification(result):
+    """
+    Whether a fact checker result may be reused; partial results (errors,
+    skipped sources) are not.
+    """
+    return result.get("verified") != "error" and not result.get("skipped_sources")
+
+def check_claim_with_fact_checker(claim):
+    """
+    Verify a claim with the fact checker, reusing a recent verdict stored in
+    the database for the same claim fingerprint.
+    """
+    if CLAIM_VERDICT_MAX_AGE > 0:
+        stored = db.get_claim_verdict(claim, CLAIM_VERDICT_MAX_AGE, source='fact_checker')
+        if stored:
+            verification = stored['verification']
+            verification["verdict_stored_at"] = stored['verified_at']
+            return verification
+    
+    verification = fact_checker.verify_claim(claim)
+    if is_complete_verification(verification):
+        db.record_claim_verdict(claim, verification, 'fact_checker')
+    return verification
+
+def verify_claim(claim):
+    """
+    Verify a claim against the fact database and generate a detailed response.
+    """
+    # Use our new fact checker for real-world verification, reusing recent results
+    # for the same claim; partial results (errors, skipped sources) aren't cached
+    verification, cached = fact_check_cache.get_or_compute(
+        claim,
+        check_claim_with_fact_checker,
+        cacheable=is_complete_verification
+    )
+    verification["cached"] = cached
+    return verification
+
+def stored_gpt_verdict(claim):
+    """
+    Return a recent GPT verdict stored in the database for the claim's
+    fingerprint, shaped like a GPTAnalyzer.verify_claim result, or None.
+    """
+    if CLAIM_VERDICT_MAX_AGE <= 0:
+        return None
+    stored = db.get_claim_verdict(claim, CLAIM_VERDICT_MAX_AGE, source='gpt-4')
+    if not stored:
+        return None
+    return {
+        "success": True,
+        "claim": claim,
+        "verification": stored['verification'],
+        "timestamp": stored['verified_at'],
+        "model": stored['source'],
+        "verdict_stored_at": stored['verified_at']
+    }
+
+def record_gpt_verdict(claim, result):
+    """Store a GPT verdict for reuse; simulated fallback verdicts are never stored."""
+    if result['success'] and result.get('model') == 'gpt-4':
+        db.record_claim_verdict(claim, result['verification'], 'gpt-4')
+
+def check_claim_with_gpt(claim, bypass_cache=False):
+    """
+    Verify a claim with GPT, reusing a recent verdict stored in the database for
+    the same claim fingerprint unless bypass_cache is set.
+    """
+    stored = None if bypass_cache else stored_gpt_verdict(claim)
+    if stored:
+        return stored
+    
+    result = gpt_analyzer.verify_claim(claim, bypass_cache=bypass_cache)
+    record_gpt_verdict(claim, result)
+    return result
+
+def check_claims_with_gpt(claims, bypass_cache=False):
+    """
+    Verify several claims with GPT, packing the ones without a recent stored
+    verdict into batched requests. Returns (result, cached) pairs in input order.
+    """
+    results = [None] * len(claims)
+    pending = []
+    for index, claim in enumerate(claims):
+        stored = None if bypass_cache else stored_gpt_verdict(claim)
+        if stored:
+            results[index] = (stored, True)
+        else:
+            pending.append(index)
+    
+    verified = gpt_analyzer.verify_claims([claims[index] for index in pending],
+                                          batch_size=GPT_VERIFY_BATCH_SIZE, bypass_cache=bypass_cache)
+    for index, result in zip(pending, verified):
+        record_gpt_verdict(claims[index], result)
+        results[index] = (result, False)
+    return results
+
+def verification_error(explanation, reason="An error occurred during verification."):
+    """
+    Build the verification payload returned for a claim that could not be verified.
+    """
+    return {
+        "verified": "error",
+        "confidence": 0,
+        "explanation": explanation,
+        "related_facts": [],
+        "sources": [],
+        "counter_arguments": [],
+        "reason": reason
+    }
+
+def verification_limits(data):
+    """
+    Read the per-request max_workers and timeout overrides, which can only lower
+    the configured limits. Raises ValueError for a non-numeric or non-positive value.
+    """
+    max_workers = CLAIM_VERIFICATION_WORKERS
+    timeout = CLAIM_VERIFICATION_TIMEOUT
+    if data.get('max_workers') is not None:
+        try:
+            requested = int(data['max_workers'])
+        except (TypeError, ValueError):
+            requested = 0
+        if requested <= 0:
+            raise ValueError("max_workers must be a positive integer")
+        max_workers = min(requested, CLAIM_VERIFICATION_WORKERS)
+    if data.get('timeout') is not None:
+        try:
+            requested = float(data['timeout'])
+        except (TypeError, ValueError):
+            requested = 0.0
+        if not requested > 0:
+            raise ValueError("timeout must be a positive number of seconds")
+        timeout = min(requested, CLAIM_VERIFICATION_TIMEOUT)
+    return max_workers, timeout
+
+def iter_claim_verifications(claim_percentages, max_workers=CLAIM_VERIFICATION_WORKERS,
+                             timeout=CLAIM_VERIFICATION_TIMEOUT):
+    """
+    Verify claims on a bounded thread pool, yielding (index, verified_claim)
+    pairs as soon as each claim finishes.
+    
+    Each claim is verified independently: an exception only marks that claim as
+    an error, and claims still pending when the deadline (in seconds) passes are
+    reported as timed out instead of holding up the whole response.
+    """
+    if not claim_percentages:
+        return
+    
+    def verified_claim(index, verification):
+        return {
+            'claim': claim_percentages[index]['claim'],
+            'percentage': claim_percentages[index]['percentage'],
+            'verification': verification
+        }
+    
+    max_workers = max(1, min(int(max_workers), len(claim_percentages)))
+    deadline = time.monotonic() + float(timeout)
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='claim-verifier')
+    try:
+        futures = {
+            executor.submit(verify_claim, claim_data['claim']): index
+            for index, claim_data in enumerate(claim_percentages)
+        }
+        pending = set(futures)
+        
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = futures[future]
+                claim = claim_percentages[index]['claim']
+                try:
+                    verification = future.result()
+                except Exception as e:
+                    import traceback
+                    print(f"Error verifying claim '{claim}': {str(e)}")
+                    print(traceback.format_exc())  # Print full traceback
+                    verification = verification_error(f"Error during verification: {str(e)}")
+                yield index, verified_claim(index, verification)
+        
+        for future in pending:
+            index = futures[future]
+            print(f"Verification deadline exceeded for claim '{claim_percentages[index]['claim']}'")
+            yield index, verified_claim(index, verification_error(
+                f"Verification did not finish within {float(timeout):g} seconds.",
+                reason="Verification timed out."
+            ))
+    finally:
+        # Don't block the response (or a closed stream) on claims still running
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def verify_claims_concurrently(claim_percentages, max_workers=CLAIM_VERIFICATION_WORKERS,
+                               timeout=CLAIM_VERIFICATION_TIMEOUT):
+    """
+    Verify claims on a bounded thread pool and return them in their original order.
+    """
+    verified_claims = [None] * len(claim_percentages)
+    for index, verified_claim in iter_claim_verifications(claim_percentages, max_workers, timeout):
+        verified_claims[index] = verified_claim
+    return verified_claims
+
+def format_stream_event(event, payload, stream_format):
+    """
+    Serialize one streaming event as an NDJSON line or a Server-Sent Event.
+    """
+    if stream_format == 'sse':
+        return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+    return json.dumps({'event': event, **payload}) + "\n"
+
+@app.route('/')
+def home():
+    return send_from_directory(app.static_folder, 'index.html')
+
+@app.route('/test_fact_checker.html')
+def test_fact_checker():
+    return send_from_directory(app.static_folder, 'test_fact_checker.html')
+
+@app.route('/test.html')
+def test():
+    return send_from_directory(app.static_folder, 'test.html')
+
+@app.route('/api/analyze/claims', methods=['POST'])
+def analyze_claims():
+    try:
+        data = request.get_json()
+        if not data or 'text' not in data:
+            return jsonify({"error": "No text provided"}), 400
+        
+        try:
+            max_workers, timeout = verification_limits(data)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+            
+        text = data['text']
+        print(f"Received text for analysis: {text[:100]}...")  # Debug log
+        
+        # Extract claims and calculate percentages
+        try:
+            claims = extract_claims(text)
+            print(f"Extracted {len(claims)} claims")  # Debug log
+            if not claims:
+                print("No claims were extracted from the text")
+                return jsonify({
+                    'claims': [],
+                    'total_claims': 0,
+                    'message': 'No claims were found in the provided text.'
+                })
+        except Exception as e:
+            import traceback
+            print(f"Error extracting claims: {str(e)}")
+            print(traceback.format_exc())  # Print full traceback
+            return jsonify({"error": f"Error extracting claims: {str(e)}"}), 500
+            
+        try:
+            claim_percentages = calculate_claim_percentages(claims)
+            print(f"Calculated claim percentages: {claim_percentages}")  # Debug log
+        except Exception as e:
+            import traceback
+            print(f"Error calculating claim percentages: {str(e)}")
+            print(traceback.format_exc())  # Print full traceback
+            return jsonify({"error": f"Error calculating claim percentages: {str(e)}"}), 500
+        
+        # Verify claims concurrently, bounded by worker count and a request deadline
+        verified_claims = verify_claims_concurrently(claim_percentages, max_workers, timeout)
+        
+        return jsonify({
+            'claims': verified_claims,
+            'total_claims': len(claims)
+        })
+    except Exception as e:
+        import traceback
+        print(f"Error in analyze_claims: {str(e)}")
+        print(traceback.format_exc())  # Print full traceback
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/analyze/claims/stream', methods=['POST'])
+def analyze_claims_stream():
+    """
+    Streaming variant of /api/analyze/claims.
+    
+    Sends the extracted claims right away, then one event per claim as soon as
+    its verification finishes, then a summary event. The format is NDJSON by
+    default, or Server-Sent Events with format=sse (or an Accept: text/event-stream header).
+    """
+    try:
+        data = request.get_json()
+        if not data or 'text' not in data:
+            return jsonify({"error": "No text provided"}), 400
+        
+        stream_format = data.get('format') or request.args.get('format')
+        if not stream_format:
+            stream_format = 'sse' if 'text/event-stream' in request.headers.get('Accept', '') else 'ndjson'
+        if stream_format not in ('ndjson', 'sse'):
+            return jsonify({"error": "format must be 'ndjson' or 'sse'"}), 400
+        try:
+            max_workers, timeout = verification_limits(data)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        text = data['text']
+        claims = extract_claims(text)
+        claim_percentages = calculate_claim_percentages(claims)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    
+    def generate():
+        started = time.monotonic()
+        yield format_stream_event('claims', {
+            'claims': claim_percentages,
+            'total_claims': len(claims)
+        }, stream_format)
+        
+        statuses = {}
+        for index, verified_claim in iter_claim_verifications(claim_percentages, max_workers, timeout):
+            status = verified_claim['verification'].get('verified')
+            statuses[status] = statuses.get(status, 0) + 1
+            yield format_stream_event('claim', {'index': index, **verified_claim}, stream_format)
+        
+        yield format_stream_event('summary', {
+            'total_claims': len(claims),
+            'statuses': statuses,
+            'elapsed': round(time.monotonic() - started, 3)
+        }, stream_format)
+    
+    mimetype = 'text/event-stream' if stream_format == 'sse' else 'application/x-ndjson'
+    return Response(stream_with_context(generate()), mimetype=mimetype,
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/extract-claims', methods=['POST'])
+def extract_claims_endpoint():
+    """Extract claims, with indicators and strength scores, from one or more texts."""
+    try:
+        data = request.get_json()
+        if not data or not ('texts' in data or 'text' in data):
+            return jsonify({"error": "No text provided"}), 400
+        
+        texts = data['texts'] if 'texts' in data else [data['text']]
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            return jsonify({"error": "texts must be a list of strings"}), 400
+        
+        documents = extract_claims_batch(texts)
+        return jsonify({
+            'documents': [{
+                'claims': claims,
+                'total_claims': len(claims)
+            } for claims in documents]
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/microphones', methods=['GET'])
+def get_microphones():
+    """Get a list of available microphones."""
+    microphones = vtt.list_microphones()
+    return jsonify(microphones)
+
+@app.route('/api/voice-to-text', methods=['POST'])
+def voice_to_text():
+    temp_file = None
+    try:
+        if 'audio' not in request.files:
+            return jsonify({"error": "No audio file provided"}), 400
+
+        audio_file = request.files['audio']
+        
+        # Create a temporary file with a .wav extension
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
+        temp_path = temp_file.name
+        temp_file.close()
+        
+        # Save the uploaded file
+        audio_file.save(temp_path)
+        
+        # Process the audio file using our VoiceToText class
+        recognizer = sr.Recognizer()
+        with sr.AudioFile(temp_path) as source:
+            # Adjust for ambient noise
+            recognizer.adjust_for_ambient_noise(source, duration=0.5)
+            # Record the audio
+            audio_data = recognizer.record(source)
+            
+            # Try to recognize the speech
+            result = {
+                "success": False,
+                "text": None,
+                "error": None
+            }
+            
+            # Try Google's service first
+            try:
+                text = recognizer.recognize_google(audio_data, language="en-US")
+                result["success"] = True
+                result["text"] = text
+                result["service"] = "google"
+            except sr.UnknownValueError:
+                result["error"] = "Speech recognition could not understand the audio. Please speak more clearly."
+            except sr.RequestError as e:
+                result["error"] = f"Google Speech Recognition service error: {e}"
+                
+            # If Google fails and Sphinx is available, try Sphinx (offline recognition)
+            if not result["success"] and hasattr(vtt, 'SPHINX_AVAILABLE') and vtt.SPHINX_AVAILABLE:
+                try:
+                    text = recognizer.recognize_sphinx(audio_data)
+                    result["success"] = True
+                    result["text"] = text
+                    result["service"] = "sphinx"
+                except Exception as e:
+                    result["error"] = f"Sphinx recognition failed: {e}"
+            
+            if result["success"]:
+                return jsonify(result)
+            else:
+                return jsonify({"error": result["error"]}), 400
+            
+    except Exception as e:
+        return jsonify({"error": f"Error processing audio: {str(e)}"}), 500
+    finally:
+        # Clean up the temporary file
+        if temp_file and os.path.exists(temp_path):
+            try:
+                os.unlink(temp_path)
+            except:
+                pass
+
+@app.route('/api/analyze', methods=['POST'])
+def analyze_text():
+    """
+    Analyze text using GPT and store results in database.
+    
+    With stream=true (or an Accept: text/event-stream header) the response is
+    streamed as Server-Sent Events (or NDJSON with format=ndjson): 'token'
+    events with each piece of the GPT response, 'field' events as each
+    top-level field of its JSON completes, and a final 'result' event with the
+    parsed result and its analysis_id (or an 'error' event). Chunked analyses
+    of long texts send a 'chunk' (or 'chunk_error') event per chunk instead of
+    tokens and fields.
+    """
+    try:
+        data = request.json
+        text = data.get('text')
+        analysis_type = data.get('analysis_type', 'general')
+        
+        if not text:
+            return jsonify({"error": "No text provided"}), 400
+        
+        if data.get('stream') or 'text/event-stream' in request.headers.get('Accept', ''):
+            stream_format = data.get('format') or request.args.get('format') or 'sse'
+            if stream_format not in ('ndjson', 'sse'):
+                return jsonify({"error": "format must be 'ndjson' or 'sse'"}), 400
+            chunked = data.get('chunked')
+            return stream_analysis(text, analysis_type, bool(data.get('bypass_cache')),
+                                   None if chunked is None else bool(chunked), stream_format)
+        
+        # Analyze text using GPT; bypass_cache forces a fresh completion and
+        # chunked forces (true) or disables (false) chunking of long texts
+        chunked = data.get('chunked')
+        analysis_result = gpt_analyzer.analyze_text(text, analysis_type,
+                                                    bypass_cache=bool(data.get('bypass_cache')),
+                                                    chunked=None if chunked is None else bool(chunked))
+        
+        if analysis_result['success']:
+            # Save to database
+            analysis_id = db.save_analysis(
+                text=text,
+                analysis_type=analysis_type,
+                results=analysis_result['results'],
+                source='gpt-4',
+                confidence_score=analysis_result.get('confidence_score')
+            )
+            
+            # Add database ID to response
+            analysis_result['analysis_id'] = analysis_id
+            
+            return jsonify(analysis_result)
+        else:
+            return jsonify({"error": analysis_result['error']}), 500
+            
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+def stream_analysis(text, analysis_type, bypass_cache, chunked, stream_format):
+    """Stream a GPT analysis as events, saving the final result to the database."""
+    def generate():
+        for event, payload in gpt_analyzer.stream_analysis(text, analysis_type, bypass_cache=bypass_cache,
+                                                           chunked=chunked):
+            if event != 'result':
+                yield format_stream_event(event, payload, stream_format)
+            elif not payload['success']:
+                yield format_stream_event('error', {'error': payload['error']}, stream_format)
+            else:
+                try:
+                    payload['analysis_id'] = db.save_analysis(
+                        text=text,
+                        analysis_type=analysis_type,
+                        results=payload['results'],
+                        source='gpt-4',
+                        confidence_score=payload.get('confidence_score')
+                    )
+                except Exception as e:
+                    yield format_stream_event('error', {'error': str(e)}, stream_format)
+                else:
+                    yield format_stream_event('result', payload, stream_format)
+    
+    mimetype = 'text/event-stream' if stream_format == 'sse' else 'application/x-ndjson'
+    return Response(stream_with_context(generate()), mimetype=mimetype,
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def save_claim_verification(claim, verification_result):
+    """Save a successful GPT claim verification and add its analysis ID to the result."""
+    verification_result['analysis_id'] = db.save_analysis(
+        text=claim,
+        analysis_type='claim_verification',
+        results=verification_result['verification'],
+        source='gpt-4',
+        confidence_score=verification_result['verification'].get('confidence_score')
+    )
+    return verification_result
+
+@app.route('/api/verify-claim', methods=['POST'])
+def verify_claim_endpoint():
+    """Verify a specific claim, or a list of claims, using GPT."""
+    try:
+        data = request.json
+        claim = data.get('claim')
+        claims = data.get('claims')
+        if claims is None and isinstance(claim, list):
+            claims = claim
+        
+        if claims is not None:
+            if not isinstance(claims, list) or not claims or not all(isinstance(c, str) and c.strip() for c in claims):
+                return jsonify({"error": "claims must be a non-empty list of claims"}), 400
+            if len(claims) > MAX_VERIFY_CLAIMS:
+                return jsonify({"error": f"At most {MAX_VERIFY_CLAIMS} claims can be verified at once"}), 400
+            
+            if data.get('bypass_cache'):
+                verified = check_claims_with_gpt(claims, bypass_cache=True)
+            else:
+                # Reuse recent or in-flight verifications of the same claims, and
+                # send only the rest to GPT in batched requests
+                verified = gpt_claim_cache.get_or_compute_many(
+                    claims,
+                    lambda pending: [result for result, _ in check_claims_with_gpt(pending)],
+                    cacheable=lambda result: result['success']
+                )
+            
+            # Each claim succeeds or fails on its own
+            results = []
+            for verification_result, cached in verified:
+                # Verdicts reused from the database count as cached too
+                verification_result['cached'] = cached or 'verdict_stored_at' in verification_result
+                if verification_result['success']:
+                    save_claim_verification(verification_result['claim'], verification_result)
+                results.append(verification_result)
+            return jsonify({"results": results})
+        
+        if not claim:
+            return jsonify({"error": "No claim provided"}), 400
+        
+        if data.get('bypass_cache'):
+            # Force a fresh verification, skipping every cache
+            verification_result, cached = check_claim_with_gpt(claim, bypass_cache=True), False
+        else:
+            # Verify claim using GPT, reusing a recent, stored or in-flight verification of the same claim
+            verification_result, cached = gpt_claim_cache.get_or_compute(
+                claim,
+                check_claim_with_gpt,
+                cacheable=lambda result: result['success']
+            )
+        verification_result['cached'] = cached
+        
+        if verification_result['success']:
+            # Save to database and add its ID to the response
+            return jsonify(save_claim_verification(claim, verification_result))
+        else:
+            return jsonify({"error": verification_result['error']}), 500
+            
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/analysis/<int:analysis_id>', methods=['GET'])
+def get_analysis(analysis_id):
+    """Retrieve a specific analysis by ID."""
+    try:
+        analysis = db.get_analysis(analysis_id)
+        
+        if analysis:
+            return jsonify(analysis)
+        else:
+            return jsonify({"error": "Analysis not found"}), 404
+            
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# Most IDs accepted by one /api/analyses/batch request
+MAX_BATCH_ANALYSES = int(os.environ.get('MAX_BATCH_ANALYSES', 1000))
+
+@app.route('/api/analyses/batch', methods=['POST'])
+def get_analyses_batch():
+    """Retrieve many analyses by ID in one request."""
+    try:
+        data = request.json or {}
+        ids = data.get('ids')
+        
+        if not isinstance(ids, list) or not ids:
+            return jsonify({"error": "No ids provided"}), 400
+        if len(ids) > MAX_BATCH_ANALYSES:
+            return jsonify({"error": f"At most {MAX_BATCH_ANALYSES} ids can be requested at once"}), 400
+        if not all(isinstance(analysis_id, int) for analysis_id in ids):
+            return jsonify({"error": "ids must be integers"}), 400
+        
+        analyses = db.get_analyses(ids)
+        found = {analysis['id'] for analysis in analyses}
+        return jsonify({
+            'analyses': analyses,
+            'missing': [analysis_id for analysis_id in dict.fromkeys(ids) if analysis_id not in found]
+        })
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/recent-analyses', methods=['GET'])
+def get_recent_analyses():
+    """Get recent analyses."""
+    try:
+        limit = request.args.get('limit', default=10, type=int)
+        before_id = request.args.get('before_id', type=int)
+        before_ts = request.args.get('before_ts')
+        # view=summary skips the results blob and returns a text preview instead
+        summary = request.args.get('view') == 'summary'
+        preview_length = request.args.get('preview_length', default=200, type=int)
+        analyses = db.get_recent_analyses(limit, before_id=before_id, before_ts=before_ts,
+                                          summary=summary, preview_length=preview_length)
+        
+        response = jsonify(analyses)
+        if len(analyses) == limit:
+            # Cursor for the next page: pass these back as before_id/before_ts
+            response.headers['X-Next-Before-Id'] = str(analyses[-1]['id'])
+            response.headers['X-Next-Before-Ts'] = analyses[-1]['created_at']
+        return response
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/search', methods=['GET'])
+def search_analyses():
+    """Full-text search over stored analyses and claims."""
+    try:
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({"error": "No query provided"}), 400
+        
+        limit = min(request.args.get('limit', default=20, type=int), 100)
+        offset = request.args.get('offset', default=0, type=int)
+        kind = request.args.get('kind')
+        if kind not in (None, 'analysis', 'claim'):
+            return jsonify({"error": "kind must be 'analysis' or 'claim'"}), 400
+        # A date range that reaches back into archived months also searches those archives
+        start = request.args.get('start')
+        end = request.args.get('end')
+        for value in (start, end):
+            if value is not None and not re.fullmatch(r'\d{4}-\d{2}-\d{2}', value):
+                return jsonify({"error": "start and end must be dates formatted as YYYY-MM-DD"}), 400
+        
+        results = db.search(query, limit=limit, offset=offset, kind=kind, start=start, end=end)
+        return jsonify({
+            'query': query,
+            'results': results,
+            'limit': limit,
+            'offset': offset,
+            'next_offset': offset + limit if len(results) == limit else None
+        })
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/stats', methods=['GET'])
+def get_stats():
+    """Get daily analysis statistics over a date range (start/end as YYYY-MM-DD, UTC)."""
+    try:
+        start = request.args.get('start')
+        end = request.args.get('end')
+        for value in (start, end):
+            if value is not None and not re.fullmatch(r'\d{4}-\d{2}-\d{2}', value):
+                return jsonify({"error": "start and end must be dates formatted as YYYY-MM-DD"}), 400
+        
+        stats = db.get_stats(start=start, end=end, analysis_type=request.args.get('analysis_type'))
+        stats['start'] = start
+        stats['end'] = end
+        return jsonify(stats)
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/export', methods=['GET'])
+def export_analyses():
+    """
+    Stream every analysis with an ID above since_id as NDJSON, optionally
+    gzip-compressed, including analyses moved to the monthly archives.
+    Resume an incremental export from the last exported id.
+    """
+    since_id = request.args.get('since_id', default=0, type=int)
+    page_size = max(1, min(request.args.get('page_size', default=1000, type=int), 5000))
+    compress = request.args.get('gzip', '').lower() in ('1', 'true', 'yes')
+    
+    def generate():
+        lines = (ndjson_line(analysis) for analysis in db.iter_analyses(since_id, page_size))
+        if not compress:
+            yield from lines
+            return
+        # wbits=31 writes a gzip container instead of a raw zlib stream
+        compressor = zlib.compressobj(wbits=31)
+        for line in lines:
+            data = compressor.compress(line.encode('utf-8'))
+            if data:
+                yield data
+        yield compressor.flush()
+    
+    if compress:
+        return Response(stream_with_context(generate()), mimetype='application/gzip',
+                        headers={'Content-Disposition': 'attachment; filename=analyses.ndjson.gz'})
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/api/db/pool-stats', methods=['GET'])
+def get_db_pool_stats():
+    """Get database connection pool statistics."""
+    try:
+        return jsonify(db.pool_stats())
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/gpt/client-stats', methods=['GET'])
+def get_gpt_client_stats():
+    """Get async GPT client statistics."""
+    try:
+        return jsonify(gpt_analyzer.client_stats())
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/gpt/cache-stats', methods=['GET'])
+def get_gpt_cache_stats():
+    """Get GPT response cache statistics."""
+    try:
+        return jsonify(gpt_analyzer.cache_stats())
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+if __name__ == '__main__':
     app.run(debug=True, host='127.0.0.1', port=5000)
\ No newline at end of file
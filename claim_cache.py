@@ -0,0 +1,228 @@
+import copy
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+def claim_fingerprint(claim: str) -> str:
+    """
+    Fingerprint a claim so that trivially different spellings share a key.
+    
+    Case, punctuation and whitespace are ignored, so "Vaccines cause autism."
+    and "vaccines  cause autism" produce the same fingerprint.
+    """
+    normalized = ' '.join(re.sub(r"[^\w\s]", ' ', claim.casefold()).split())
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+class _Flight:
+    """A computation in progress that other requests for the same claim wait on."""
+    
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class ClaimResultCache:
+    """
+    A thread-safe TTL/LRU cache of claim verification results.
+    
+    Concurrent lookups for a claim that is already being computed wait for that
+    single computation instead of starting their own (single-flight). Results
+    are stored as deep copies and every caller gets its own deep copy, so
+    callers may modify what they get back.
+    """
+    
+    def __init__(self, ttl: float = 600, max_entries: int = 10000):
+        """
+        Initialize the cache.
+        
+        Args:
+            ttl: Seconds a cached result stays valid
+            max_entries: Maximum number of cached claims before LRU eviction
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+    
+    def get_or_compute(self, claim: str, compute: Callable[[str], Any],
+                       cacheable: Optional[Callable[[Any], bool]] = None) -> Tuple[Any, bool]:
+        """
+        Return the cached result for a claim, computing it at most once.
+        
+        Args:
+            claim: The claim text
+            compute: Function that verifies the claim
+            cacheable: Optional predicate deciding whether a result may be cached
+        
+        Returns:
+            Tuple of (result, cached) where cached is True when the result came
+            from the cache or from another request's in-flight computation
+        """
+        key = claim_fingerprint(claim)
+        now = time.monotonic()
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                flight = self._in_flight.get(key)
+                leader = flight is None
+                if leader:
+                    flight = _Flight()
+                    self._in_flight[key] = flight
+                    self.misses += 1
+                else:
+                    self.shared += 1
+        
+        if entry is not None:
+            # Stored snapshots are never modified, so they can be copied outside the lock
+            return copy.deepcopy(entry[1]), True
+        
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result), True
+        
+        try:
+            flight.result = compute(claim)
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            self._land(key, flight, cacheable)
+        
+        return copy.deepcopy(flight.result), False
+    
+    def get_or_compute_many(self, claims: List[str], compute_many: Callable[[List[str]], List[Any]],
+                            cacheable: Optional[Callable[[Any], bool]] = None) -> List[Tuple[Any, bool]]:
+        """
+        Return the cached results for several claims, computing all the missing
+        ones with a single compute_many call.
+        
+        Claims another request is already computing are waited on instead of
+        being computed again, and a claim repeated in the list is computed once.
+        
+        Args:
+            claims: The claim texts
+            compute_many: Function that verifies a list of claims, returning one
+                result per claim in the same order
+            cacheable: Optional predicate deciding whether a result may be cached
+        
+        Returns:
+            One (result, cached) tuple per claim, in input order, where cached is
+            True when the result came from the cache, from another request's
+            in-flight computation, or from an earlier repeat of the same claim
+        """
+        keys = [claim_fingerprint(claim) for claim in claims]
+        now = time.monotonic()
+        hits: Dict[str, Any] = {}
+        waiting: Dict[str, _Flight] = {}
+        leading: "OrderedDict[str, Tuple[str, _Flight]]" = OrderedDict()
+        
+        with self._lock:
+            for key, claim in zip(keys, claims):
+                if key in hits or key in waiting or key in leading:
+                    continue
+                entry = self._entries.get(key)
+                if entry is not None and now - entry[0] > self.ttl:
+                    del self._entries[key]
+                    entry = None
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    hits[key] = entry[1]
+                elif key in self._in_flight:
+                    waiting[key] = self._in_flight[key]
+                    self.shared += 1
+                else:
+                    flight = _Flight()
+                    self._in_flight[key] = flight
+                    self.misses += 1
+                    leading[key] = (claim, flight)
+        
+        if leading:
+            try:
+                computed = compute_many([claim for claim, _ in leading.values()])
+                if len(computed) != len(leading):
+                    raise ValueError(f"Expected {len(leading)} claim results, got {len(computed)}")
+                for (_, flight), result in zip(leading.values(), computed):
+                    flight.result = result
+            except Exception as e:
+                for _, flight in leading.values():
+                    flight.error = e
+                raise
+            finally:
+                for key, (_, flight) in leading.items():
+                    self._land(key, flight, cacheable)
+        
+        results = []
+        returned = set()
+        for key in keys:
+            if key in hits:
+                results.append((copy.deepcopy(hits[key]), True))
+            elif key in waiting:
+                flight = waiting[key]
+                flight.event.wait()
+                if flight.error is not None:
+                    raise flight.error
+                results.append((copy.deepcopy(flight.result), True))
+            else:
+                results.append((copy.deepcopy(leading[key][1].result), key in returned))
+            returned.add(key)
+        return results
+    
+    def _land(self, key: str, flight: _Flight, cacheable: Optional[Callable[[Any], bool]]):
+        """Cache a finished computation's result if allowed, then release its waiters."""
+        # Waiters must be released even if caching the result fails
+        try:
+            if flight.error is None and self._is_cacheable(flight.result, cacheable):
+                snapshot = copy.deepcopy(flight.result)
+                with self._lock:
+                    self._entries[key] = (time.monotonic(), snapshot)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            flight.event.set()
+    
+    @staticmethod
+    def _is_cacheable(result: Any, cacheable: Optional[Callable[[Any], bool]]) -> bool:
+        """Apply the cacheable predicate, treating a predicate that raises as a no."""
+        if cacheable is None:
+            return True
+        try:
+            return bool(cacheable(result))
+        except Exception as e:
+            print(f"Not caching claim result, cacheable check failed: {e}")
+            return False
+    
+    def clear(self):
+        """Remove every cached result."""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current cache size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "shared": self.shared,
+                "size": len(self._entries),
+                "max_entries": self.max_entries
+            }
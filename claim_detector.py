@@ -0,0 +1,127 @@
+import re
+from typing import Dict, Iterable, List, Any, Optional
+from nltk.tokenize import sent_tokenize
+
+# Weights used when no explicit weight is given for an indicator
+COPULA_INDICATORS = {'is', 'are', 'was', 'were'}
+COPULA_WEIGHT = 0.2
+WORD_WEIGHT = 0.5
+PHRASE_WEIGHT = 0.8
+
+# Default minimum claim strength: one non-copula indicator is enough, but a
+# sentence whose only indicators are copulas ("is", "was", ...) is not a claim
+DEFAULT_MIN_STRENGTH = WORD_WEIGHT
+
+class ClaimDetector:
+    """
+    Detects claim sentences with one precompiled, word-boundary-aware pattern.
+    
+    Every indicator that fires in a sentence contributes its weight to a
+    claim-strength score between 0 and 1, combined as a noisy-or so that
+    several weak indicators add up without ever exceeding 1.
+    """
+    
+    def __init__(self, indicators: Iterable[str], weights: Optional[Dict[str, float]] = None,
+                 min_words: int = 3, min_strength: float = DEFAULT_MIN_STRENGTH):
+        """
+        Compile the detector.
+        
+        Args:
+            indicators: Words and phrases that indicate a claim
+            weights: Optional per-indicator weights overriding the defaults
+            min_words: Sentences with fewer words are never claims
+            min_strength: Minimum claim-strength score for a sentence to count as a claim
+        """
+        self.indicators = sorted({indicator.lower() for indicator in indicators})
+        self.weights = {indicator: self._default_weight(indicator) for indicator in self.indicators}
+        self.weights.update({indicator.lower(): weight for indicator, weight in (weights or {}).items()})
+        self.min_words = min_words
+        self.min_strength = min_strength
+        
+        # Longest alternatives first so "according to research" beats "according to"
+        alternatives = sorted(self.indicators, key=len, reverse=True)
+        self.pattern = re.compile(
+            r"\b(?:" + "|".join(re.escape(indicator).replace(r"\ ", r"\s+") for indicator in alternatives) + r")\b",
+            re.IGNORECASE
+        )
+    
+    @staticmethod
+    def _default_weight(indicator: str) -> float:
+        if indicator in COPULA_INDICATORS:
+            return COPULA_WEIGHT
+        if ' ' in indicator:
+            return PHRASE_WEIGHT
+        return WORD_WEIGHT
+    
+    def detect(self, sentence: str) -> Dict[str, Any]:
+        """
+        Score a single sentence.
+        
+        Args:
+            sentence: The sentence to check
+        
+        Returns:
+            Dictionary with the indicators that fired and the claim-strength score
+        """
+        fired = []
+        for match in self.pattern.finditer(sentence):
+            indicator = ' '.join(match.group(0).lower().split())
+            if indicator not in fired:
+                fired.append(indicator)
+        
+        miss = 1.0
+        for indicator in fired:
+            miss *= 1.0 - self.weights.get(indicator, WORD_WEIGHT)
+        
+        return {
+            "indicators": fired,
+            "strength": round(1.0 - miss, 4)
+        }
+    
+    def extract(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Extract claim sentences from a text.
+        
+        Args:
+            text: The text to analyze
+        
+        Returns:
+            List of dictionaries with the claim text, fired indicators and strength
+        """
+        claims = []
+        for sentence in sent_tokenize(text):
+            detection = self.detect_claim(sentence)
+            if detection is not None:
+                claims.append({"claim": sentence.strip(), **detection})
+        return claims
+    
+    def detect_claim(self, sentence: str) -> Optional[Dict[str, Any]]:
+        """
+        Score a single sentence if it counts as a claim.
+        
+        Args:
+            sentence: The sentence to check
+        
+        Returns:
+            The detect result, or None if the sentence is too short or too weak a claim
+        """
+        # Skip very short sentences
+        if len(sentence.split()) < self.min_words:
+            return None
+        
+        detection = self.detect(sentence)
+        if not detection["indicators"] or detection["strength"] < self.min_strength:
+            return None
+        return detection
+    
+    def extract_batch(self, texts: Iterable[str]) -> List[List[Dict[str, Any]]]:
+        """
+        Extract claims from many documents at once.
+        
+        Args:
+            texts: The documents to analyze
+        
+        Returns:
+            One list of claims per document, in input order
+        """
+        return [self.extract(text) for text in texts]
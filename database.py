@@ -1,133 +1,1335 @@
-import sqlite3
-from datetime import datetime
-import json
-
-class Database:
-    def __init__(self, db_path="debatesphere.db"):
-        self.db_path = db_path
-        self.init_db()
-    
-    def init_db(self):
-        """Initialize the database with required tables."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create analysis table
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS analyses (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            text TEXT NOT NULL,
-            analysis_type TEXT NOT NULL,
-            results TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            source TEXT,
-            confidence_score REAL
-        )
-        ''')
-        
-        # Create claims table
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS claims (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            analysis_id INTEGER,
-            claim_text TEXT NOT NULL,
-            verification_status TEXT,
-            verification_source TEXT,
-            confidence_score REAL,
-            FOREIGN KEY (analysis_id) REFERENCES analyses (id)
-        )
-        ''')
-        
-        conn.commit()
-        conn.close()
-    
-    def save_analysis(self, text, analysis_type, results, source=None, confidence_score=None):
-        """Save a text analysis result to the database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        INSERT INTO analyses (text, analysis_type, results, source, confidence_score)
-        VALUES (?, ?, ?, ?, ?)
-        ''', (text, analysis_type, json.dumps(results), source, confidence_score))
-        
-        analysis_id = cursor.lastrowid
-        
-        # If results contain claims, save them separately
-        if 'claims' in results:
-            for claim in results['claims']:
-                cursor.execute('''
-                INSERT INTO claims (analysis_id, claim_text, verification_status, 
-                                  verification_source, confidence_score)
-                VALUES (?, ?, ?, ?, ?)
-                ''', (analysis_id, claim['text'], claim.get('status'),
-                     claim.get('source'), claim.get('confidence')))
-        
-        conn.commit()
-        conn.close()
-        return analysis_id
-    
-    def get_analysis(self, analysis_id):
-        """Retrieve a specific analysis by ID."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        SELECT * FROM analyses WHERE id = ?
-        ''', (analysis_id,))
-        
-        analysis = cursor.fetchone()
-        
-        if analysis:
-            # Get associated claims
-            cursor.execute('''
-            SELECT * FROM claims WHERE analysis_id = ?
-            ''', (analysis_id,))
-            
-            claims = cursor.fetchall()
-            
-            result = {
-                'id': analysis[0],
-                'text': analysis[1],
-                'analysis_type': analysis[2],
-                'results': json.loads(analysis[3]),
-                'created_at': analysis[4],
-                'source': analysis[5],
-                'confidence_score': analysis[6],
-                'claims': [{
-                    'id': claim[0],
-                    'text': claim[2],
-                    'status': claim[3],
-                    'source': claim[4],
-                    'confidence': claim[5]
-                } for claim in claims]
-            }
-        else:
-            result = None
-        
-        conn.close()
-        return result
-    
-    def get_recent_analyses(self, limit=10):
-        """Get the most recent analyses."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        SELECT * FROM analyses ORDER BY created_at DESC LIMIT ?
-        ''', (limit,))
-        
-        analyses = cursor.fetchall()
-        
-        result = [{
-            'id': analysis[0],
-            'text': analysis[1],
-            'analysis_type': analysis[2],
-            'results': json.loads(analysis[3]),
-            'created_at': analysis[4],
-            'source': analysis[5],
-            'confidence_score': analysis[6]
-        } for analysis in analyses]
-        
-        conn.close()
-        return result 
\ No newline at end of file
+import os
+import sqlite3
+import threading
+import queue
+import time
+import zlib
+import gzip
+import sys
+import argparse
+from collections import Counter
+from collections.abc import Mapping
+from contextlib import contextmanager
+from datetime import datetime
+import json
+from claim_cache import claim_fingerprint
+
+# Pragmas applied to every pooled connection
+CONNECTION_PRAGMAS = {
+    'journal_mode': 'WAL',       # readers don't block the writer and vice versa
+    'synchronous': 'NORMAL',     # safe with WAL, fsyncs only at checkpoints
+    'cache_size': -32000,        # page cache size in KiB (negative) per connection
+    'mmap_size': 268435456,      # memory-map up to 256 MiB of the database file
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5000         # wait up to 5s for locks instead of failing
+}
+
+def _add_claim_fingerprint_column(conn):
+    """
+    Add claims.fingerprint unless it already exists, so that retrying an
+    interrupted upgrade is a no-op rather than a duplicate column error.
+    """
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(claims)')]
+    if 'fingerprint' not in columns:
+        conn.execute('''
+        ALTER TABLE claims ADD COLUMN fingerprint TEXT REFERENCES claim_fingerprints (fingerprint)
+        ''')
+
+def _backfill_claim_fingerprints(conn, batch_size=1000):
+    """
+    Fingerprint claims saved before the claim_fingerprints table existed,
+    batch_size claims at a time. Batches are keyset pages on id rather than one
+    open cursor, since the updates change the fingerprint index being scanned.
+    """
+    last_id = 0
+    while True:
+        rows = [(claim_fingerprint(claim_text), claim_text, claim_id) for claim_id, claim_text in conn.execute('''
+        SELECT id, claim_text FROM claims WHERE fingerprint IS NULL AND id > ? ORDER BY id LIMIT ?
+        ''', (last_id, batch_size))]
+        if not rows:
+            return
+        conn.executemany('''
+        INSERT OR IGNORE INTO claim_fingerprints (fingerprint, claim_text) VALUES (?, ?)
+        ''', [(fingerprint, claim_text) for fingerprint, claim_text, _ in rows])
+        conn.executemany('''
+        UPDATE claims SET fingerprint = ? WHERE id = ?
+        ''', [(fingerprint, claim_id) for fingerprint, _, claim_id in rows])
+        last_id = rows[-1][2]
+
+def _rollup_entry(day, analysis_type, results, confidence_score):
+    """Reduce an analysis to the fields the daily rollups count."""
+    if not isinstance(results, dict):
+        results = {}
+    statuses = [claim.get('status') for claim in results.get('claims') or []]
+    statuses.append(results.get('status'))
+    if not isinstance(confidence_score, (int, float)):
+        confidence_score = None
+    return (day, analysis_type, confidence_score, len(results.get('claims') or []),
+            tuple(status for status in statuses if isinstance(status, str)))
+
+def _add_to_rollups(conn, entries):
+    """Add rollup entries to the daily statistics tables, one upsert per day and type."""
+    totals = {}
+    statuses = Counter()
+    for day, analysis_type, confidence_score, claim_count, entry_statuses in entries:
+        total = totals.setdefault((day, analysis_type), [0, 0.0, 0, 0])
+        total[0] += 1
+        if confidence_score is not None:
+            total[1] += confidence_score
+            total[2] += 1
+        total[3] += claim_count
+        for status in entry_statuses:
+            statuses[(day, analysis_type, status)] += 1
+    
+    conn.executemany('''
+    INSERT INTO daily_analysis_stats (day, analysis_type, analyses, confidence_sum,
+                                      confidence_count, claims)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (day, analysis_type) DO UPDATE SET
+        analyses = analyses + excluded.analyses,
+        confidence_sum = confidence_sum + excluded.confidence_sum,
+        confidence_count = confidence_count + excluded.confidence_count,
+        claims = claims + excluded.claims
+    ''', [key + tuple(total) for key, total in totals.items()])
+    conn.executemany('''
+    INSERT INTO daily_status_stats (day, analysis_type, status, count) VALUES (?, ?, ?, ?)
+    ON CONFLICT (day, analysis_type, status) DO UPDATE SET count = count + excluded.count
+    ''', [key + (count,) for key, count in statuses.items()])
+
+def _rebuild_rollups(conn, batch_size=1000, archive_paths=()):
+    """
+    Recompute the daily statistics tables from every analysis stored in the
+    hot database and in the archive files at archive_paths.
+    """
+    conn.execute('DELETE FROM daily_analysis_stats')
+    conn.execute('DELETE FROM daily_status_stats')
+    _add_rollups_from(conn, conn, batch_size)
+    for path in archive_paths:
+        # A separate connection, since ATTACH is not allowed inside the open transaction
+        archive = sqlite3.connect(path)
+        try:
+            _add_rollups_from(conn, archive, batch_size)
+        finally:
+            archive.close()
+
+def _add_rollups_from(conn, source, batch_size):
+    """Add every analysis in source's analyses table to the rollups in conn."""
+    cursor = source.execute('''
+    SELECT date(created_at), analysis_type, results, confidence_score FROM analyses
+    ''')
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        _add_to_rollups(conn, [_rollup_entry(day, analysis_type, decode_results(results), confidence_score)
+                               for day, analysis_type, results, confidence_score in rows])
+
+# Schema migrations, applied in order by init_db. Each entry bumps PRAGMA user_version
+# by one, so existing databases only run the migrations they haven't seen yet.
+# A step is either an SQL statement or a function called with the connection.
+MIGRATIONS = [
+    # 1: newest-first listing and keyset pagination over analyses
+    ['''CREATE INDEX IF NOT EXISTS idx_analyses_created_at ON analyses (created_at, id)'''],
+    # 2: fetching the claims of an analysis
+    ['''CREATE INDEX IF NOT EXISTS idx_claims_analysis_id ON claims (analysis_id)'''],
+    # 3: full-text search over analysis text and claim text, kept in sync by triggers
+    [
+        '''CREATE VIRTUAL TABLE IF NOT EXISTS analyses_fts
+           USING fts5(text, content='analyses', content_rowid='id')''',
+        '''CREATE VIRTUAL TABLE IF NOT EXISTS claims_fts
+           USING fts5(claim_text, content='claims', content_rowid='id')''',
+        '''CREATE TRIGGER IF NOT EXISTS analyses_fts_insert AFTER INSERT ON analyses BEGIN
+               INSERT INTO analyses_fts (rowid, text) VALUES (new.id, new.text);
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS analyses_fts_delete AFTER DELETE ON analyses BEGIN
+               INSERT INTO analyses_fts (analyses_fts, rowid, text) VALUES ('delete', old.id, old.text);
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS analyses_fts_update AFTER UPDATE OF text ON analyses BEGIN
+               INSERT INTO analyses_fts (analyses_fts, rowid, text) VALUES ('delete', old.id, old.text);
+               INSERT INTO analyses_fts (rowid, text) VALUES (new.id, new.text);
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS claims_fts_insert AFTER INSERT ON claims BEGIN
+               INSERT INTO claims_fts (rowid, claim_text) VALUES (new.id, new.claim_text);
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS claims_fts_delete AFTER DELETE ON claims BEGIN
+               INSERT INTO claims_fts (claims_fts, rowid, claim_text) VALUES ('delete', old.id, old.claim_text);
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS claims_fts_update AFTER UPDATE OF claim_text ON claims BEGIN
+               INSERT INTO claims_fts (claims_fts, rowid, claim_text) VALUES ('delete', old.id, old.claim_text);
+               INSERT INTO claims_fts (rowid, claim_text) VALUES (new.id, new.claim_text);
+           END''',
+        # Index rows that existed before this migration
+        '''INSERT INTO analyses_fts (analyses_fts) VALUES ('rebuild')''',
+        '''INSERT INTO claims_fts (claims_fts) VALUES ('rebuild')''',
+    ],
+    # 4: one canonical row per distinct claim, keyed on claim_cache.claim_fingerprint
+    #    (its verification columns are superseded by claim_verdicts, migration 7)
+    [
+        '''CREATE TABLE IF NOT EXISTS claim_fingerprints (
+               fingerprint TEXT PRIMARY KEY,
+               claim_text TEXT NOT NULL,
+               verification BLOB,
+               verification_source TEXT,
+               verified_at TIMESTAMP
+           ) WITHOUT ROWID''',
+        _add_claim_fingerprint_column,
+        '''CREATE INDEX IF NOT EXISTS idx_claims_fingerprint ON claims (fingerprint)''',
+        _backfill_claim_fingerprints,
+    ],
+    # 5: daily rollups per analysis type, updated incrementally by save_analysis
+    [
+        '''CREATE TABLE IF NOT EXISTS daily_analysis_stats (
+               day TEXT NOT NULL,
+               analysis_type TEXT NOT NULL,
+               analyses INTEGER NOT NULL DEFAULT 0,
+               confidence_sum REAL NOT NULL DEFAULT 0,
+               confidence_count INTEGER NOT NULL DEFAULT 0,
+               claims INTEGER NOT NULL DEFAULT 0,
+               PRIMARY KEY (day, analysis_type)
+           ) WITHOUT ROWID''',
+        '''CREATE TABLE IF NOT EXISTS daily_status_stats (
+               day TEXT NOT NULL,
+               analysis_type TEXT NOT NULL,
+               status TEXT NOT NULL,
+               count INTEGER NOT NULL DEFAULT 0,
+               PRIMARY KEY (day, analysis_type, status)
+           ) WITHOUT ROWID''',
+        _rebuild_rollups,
+    ],
+    # 6: registry of monthly archive files written by archive_analyses
+    [
+        '''CREATE TABLE IF NOT EXISTS archives (
+               month TEXT PRIMARY KEY,
+               file_name TEXT NOT NULL,
+               analyses INTEGER NOT NULL DEFAULT 0,
+               min_id INTEGER,
+               max_id INTEGER,
+               min_created_at TIMESTAMP,
+               max_created_at TIMESTAMP
+           )''',
+    ],
+    # 7: the latest verification of each claim fingerprint per source, so verdicts
+    #    from different sources no longer overwrite each other
+    [
+        '''CREATE TABLE IF NOT EXISTS claim_verdicts (
+               fingerprint TEXT NOT NULL REFERENCES claim_fingerprints (fingerprint),
+               source TEXT NOT NULL,
+               verification BLOB NOT NULL,
+               verified_at TIMESTAMP NOT NULL,
+               PRIMARY KEY (fingerprint, source)
+           ) WITHOUT ROWID''',
+        '''INSERT OR IGNORE INTO claim_verdicts (fingerprint, source, verification, verified_at)
+           SELECT fingerprint, COALESCE(verification_source, ''), verification, verified_at
+           FROM claim_fingerprints WHERE verification IS NOT NULL AND verified_at IS NOT NULL''',
+        '''UPDATE claim_fingerprints SET verification = NULL, verification_source = NULL, verified_at = NULL
+           WHERE verification IS NOT NULL''',
+    ],
+]
+
+# Schema of a monthly archive file: the analyses and claims tables, plus the
+# same full-text search tables and triggers as the hot database (migration 3)
+ARCHIVE_SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS analyses (
+           id INTEGER PRIMARY KEY,
+           text TEXT NOT NULL,
+           analysis_type TEXT NOT NULL,
+           results TEXT NOT NULL,
+           created_at TIMESTAMP,
+           source TEXT,
+           confidence_score REAL
+       )''',
+    '''CREATE TABLE IF NOT EXISTS claims (
+           id INTEGER PRIMARY KEY,
+           analysis_id INTEGER,
+           claim_text TEXT NOT NULL,
+           verification_status TEXT,
+           verification_source TEXT,
+           confidence_score REAL,
+           fingerprint TEXT
+       )''',
+    '''CREATE INDEX IF NOT EXISTS idx_analyses_created_at ON analyses (created_at, id)''',
+    '''CREATE INDEX IF NOT EXISTS idx_claims_analysis_id ON claims (analysis_id)''',
+] + MIGRATIONS[2]
+
+# Markers used to highlight matched terms in search snippets
+SNIPPET_START = '<mark>'
+SNIPPET_END = '</mark>'
+
+# Format version byte prefixed to stored results blobs. Rows written before
+# compression was introduced hold plain JSON text and carry no version byte.
+RESULTS_FORMAT_ZLIB = 1
+RESULTS_COMPRESSION_LEVEL = 6
+
+def encode_results(results, compress=True):
+    """Serialize analysis results for the results column."""
+    serialized = json.dumps(results)
+    if not compress:
+        return serialized
+    return bytes([RESULTS_FORMAT_ZLIB]) + zlib.compress(serialized.encode('utf-8'), RESULTS_COMPRESSION_LEVEL)
+
+def decode_results(stored):
+    """Deserialize a results column value in any supported format."""
+    if isinstance(stored, str):
+        return json.loads(stored)
+    version = stored[0]
+    if version == RESULTS_FORMAT_ZLIB:
+        return json.loads(zlib.decompress(stored[1:]).decode('utf-8'))
+    raise ValueError(f"Unknown results format version: {version}")
+
+class LazyResults(Mapping):
+    """
+    Read-only view of a stored results value that is only decompressed and
+    decoded the first time it is accessed.
+    """
+    
+    def __init__(self, stored):
+        self._stored = stored
+        self._decoded = None
+    
+    def decoded(self):
+        if self._decoded is None:
+            self._decoded = decode_results(self._stored)
+            self._stored = None
+        return self._decoded
+    
+    def __getitem__(self, key):
+        return self.decoded()[key]
+    
+    def __iter__(self):
+        return iter(self.decoded())
+    
+    def __len__(self):
+        return len(self.decoded())
+    
+    def __repr__(self):
+        if self._decoded is None:
+            return '<LazyResults (not decoded)>'
+        return repr(self._decoded)
+
+def _json_default(o):
+    if isinstance(o, LazyResults):
+        return o.decoded()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+def ndjson_line(analysis):
+    """Serialize an analysis as one line of newline-delimited JSON."""
+    return json.dumps(analysis, default=_json_default) + '\n'
+
+# Column lists shared by the queries that build analysis and claim records
+ANALYSIS_COLUMNS = 'id, text, analysis_type, results, created_at, source, confidence_score'
+CLAIM_COLUMNS = ('id, analysis_id, claim_text, verification_status, verification_source, '
+                 'confidence_score, fingerprint')
+
+def _analysis_record(row):
+    """Build an analysis dict from a row selected with ANALYSIS_COLUMNS."""
+    return {
+        'id': row[0],
+        'text': row[1],
+        'analysis_type': row[2],
+        'results': LazyResults(row[3]),
+        'created_at': row[4],
+        'source': row[5],
+        'confidence_score': row[6]
+    }
+
+def _claim_record(row):
+    """Build a claim dict from a row selected with CLAIM_COLUMNS."""
+    return {
+        'id': row[0],
+        'text': row[2],
+        'status': row[3],
+        'source': row[4],
+        'confidence': row[5],
+        'fingerprint': row[6]
+    }
+
+# Queue marker that tells the write-behind thread to drain and exit
+_STOP_WRITER = object()
+
+class Database:
+    def __init__(self, db_path="debatesphere.db", pragmas=None, write_behind=False,
+                 batch_size=100, flush_interval_ms=50, queue_size=10000, compress_results=True,
+                 archive_dir=None, pool_size=8, pool_timeout=30.0):
+        """
+        Open the database. With write_behind=True, save_analysis only queues the
+        rows and a background thread commits them in batches of up to batch_size
+        rows or every flush_interval_ms milliseconds, whichever comes first.
+        Write-behind assumes this process is the only writer, since analysis IDs
+        are reserved in memory. With compress_results=True, new results blobs are
+        stored zlib-compressed; rows in either format can always be read.
+        Monthly archive files written by archive_analyses go to archive_dir
+        (default: an "archive" directory next to the database file).
+        At most pool_size connections are open at once; they are reused across
+        threads, and a caller waits up to pool_timeout seconds for a free one.
+        """
+        self.db_path = db_path
+        self.archive_dir = archive_dir or os.path.join(os.path.dirname(os.path.abspath(db_path)), 'archive')
+        self.compress_results = compress_results
+        self.pragmas = {**CONNECTION_PRAGMAS, **(pragmas or {})}
+        self.pool_size = pool_size
+        self.pool_timeout = pool_timeout
+        # Idle connections, most recently returned first so the warmest ones get reused
+        self._pool = queue.LifoQueue()
+        self._open_connections = 0
+        self._local = threading.local()
+        self._pool_lock = threading.Lock()
+        self._stats = {'connections_opened': 0, 'connections_closed': 0, 'checkouts': 0, 'waits': 0,
+                       'rows_flushed': 0, 'batches_flushed': 0, 'write_errors': 0}
+        self.init_db()
+        
+        self.write_behind = write_behind
+        self._writer = None
+        if write_behind:
+            self.batch_size = batch_size
+            self.flush_interval = flush_interval_ms / 1000.0
+            self._write_queue = queue.Queue(maxsize=queue_size)
+            self._id_lock = threading.Lock()
+            with self.connection() as conn:
+                self._last_id = conn.execute('''
+                SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'analyses'), 0),
+                           COALESCE((SELECT MAX(id) FROM analyses), 0))
+                ''').fetchone()[0]
+            self._writer = threading.Thread(target=self._write_behind_loop,
+                                            name='db-write-behind', daemon=True)
+            self._writer.start()
+    
+    def _open_connection(self):
+        """Open a new connection and apply the configured pragmas."""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+    
+    def _checkout(self):
+        """
+        Take an idle connection from the pool, opening a new one while fewer than
+        pool_size are open, otherwise waiting up to pool_timeout for one to be returned.
+        """
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        with self._pool_lock:
+            can_open = self._open_connections < self.pool_size
+            if can_open:
+                self._open_connections += 1
+                self._stats['connections_opened'] += 1
+            else:
+                self._stats['waits'] += 1
+        
+        if can_open:
+            try:
+                return self._open_connection()
+            except Exception:
+                with self._pool_lock:
+                    self._open_connections -= 1
+                raise
+        try:
+            return self._pool.get(timeout=self.pool_timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(
+                f"No database connection free after {self.pool_timeout}s (pool_size={self.pool_size})")
+    
+    def _discard(self, conn):
+        """Close a connection instead of returning it to the pool."""
+        conn.close()
+        with self._pool_lock:
+            self._open_connections -= 1
+            self._stats['connections_closed'] += 1
+    
+    def _release(self, conn):
+        """Return a connection to the pool, rolling back anything left uncommitted."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        self._pool.put(conn)
+    
+    @contextmanager
+    def connection(self):
+        """
+        Check out a pooled connection for the duration of the block and return it
+        afterwards. Nested blocks on the same thread share one connection. Any
+        uncommitted work is rolled back if the block raises, and when the
+        outermost block exits.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            try:
+                yield conn
+            except Exception:
+                conn.rollback()
+                raise
+            return
+        
+        conn = self._checkout()
+        self._local.conn = conn
+        with self._pool_lock:
+            self._stats['checkouts'] += 1
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            self._release(conn)
+    
+    def pool_stats(self):
+        """Return connection pool counters and the effective pragmas."""
+        with self._pool_lock:
+            stats = dict(self._stats)
+            stats['open_connections'] = self._open_connections
+        stats['idle_connections'] = self._pool.qsize()
+        stats['pool_size'] = self.pool_size
+        stats['write_behind'] = self.write_behind
+        if self.write_behind:
+            stats['write_queue_depth'] = self._write_queue.qsize()
+        with self.connection() as conn:
+            stats['pragmas'] = {
+                name: conn.execute(f"PRAGMA {name}").fetchone()[0] for name in self.pragmas
+            }
+        return stats
+    
+    def flush(self):
+        """Block until every queued write-behind row has been committed."""
+        if self.write_behind:
+            self._write_queue.join()
+    
+    def close(self):
+        """Drain the write-behind queue, then close every idle pooled connection."""
+        if self._writer is not None:
+            self._write_queue.put(_STOP_WRITER)
+            self._writer.join()
+            self._writer = None
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+    
+    def init_db(self):
+        """Initialize the database with required tables."""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            # Create analysis table
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS analyses (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                text TEXT NOT NULL,
+                analysis_type TEXT NOT NULL,
+                results TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                source TEXT,
+                confidence_score REAL
+            )
+            ''')
+            
+            # Create claims table
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS claims (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                analysis_id INTEGER,
+                claim_text TEXT NOT NULL,
+                verification_status TEXT,
+                verification_source TEXT,
+                confidence_score REAL,
+                FOREIGN KEY (analysis_id) REFERENCES analyses (id)
+            )
+            ''')
+            
+            conn.commit()
+            self._migrate(conn)
+    
+    def _migrate(self, conn):
+        """
+        Apply any schema migrations newer than the database's user_version.
+        Each migration runs in its own write transaction together with its
+        user_version bump, and the version is read after taking the write lock,
+        so processes starting at the same time apply every migration once.
+        """
+        while True:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                version = conn.execute('PRAGMA user_version').fetchone()[0]
+                if version >= len(MIGRATIONS):
+                    conn.rollback()
+                    return
+                for statement in MIGRATIONS[version]:
+                    if callable(statement):
+                        statement(conn)
+                    else:
+                        conn.execute(statement)
+                conn.execute(f'PRAGMA user_version = {version + 1}')
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+    
+    def save_analysis(self, text, analysis_type, results, source=None, confidence_score=None):
+        """Save a text analysis result to the database."""
+        if self.write_behind:
+            return self._queue_analysis(text, analysis_type, results, source, confidence_score)
+        
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+            INSERT INTO analyses (text, analysis_type, results, source, confidence_score)
+            VALUES (?, ?, ?, ?, ?)
+            ''', (text, analysis_type, encode_results(results, self.compress_results), source, confidence_score))
+            
+            analysis_id = cursor.lastrowid
+            
+            # If results contain claims, save them separately
+            self._insert_claims(conn, self._claim_rows(analysis_id, results))
+            
+            day = cursor.execute('''
+            SELECT date(created_at) FROM analyses WHERE id = ?
+            ''', (analysis_id,)).fetchone()[0]
+            _add_to_rollups(conn, [_rollup_entry(day, analysis_type, results, confidence_score)])
+            
+            conn.commit()
+        return analysis_id
+    
+    def _claim_rows(self, analysis_id, results):
+        """Build the claims table rows for an analysis result."""
+        if 'claims' not in results:
+            return []
+        return [(analysis_id, claim['text'], claim.get('status'),
+                 claim.get('source'), claim.get('confidence'), claim_fingerprint(claim['text']))
+                for claim in results['claims']]
+    
+    def _insert_claims(self, conn, claim_rows):
+        """Insert claims rows, registering fingerprints seen for the first time."""
+        conn.executemany('''
+        INSERT OR IGNORE INTO claim_fingerprints (fingerprint, claim_text) VALUES (?, ?)
+        ''', [(row[5], row[1]) for row in claim_rows])
+        conn.executemany('''
+        INSERT INTO claims (analysis_id, claim_text, verification_status, 
+                          verification_source, confidence_score, fingerprint)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ''', claim_rows)
+    
+    def _queue_analysis(self, text, analysis_type, results, source, confidence_score):
+        """Reserve an ID for an analysis and queue its rows for the write-behind thread."""
+        # Serialize on the caller's thread so later mutations of results can't leak in
+        serialized = encode_results(results, self.compress_results)
+        created_at = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+        with self._id_lock:
+            self._last_id += 1
+            analysis_id = self._last_id
+        
+        analysis_row = (analysis_id, text, analysis_type, serialized, created_at, source, confidence_score)
+        rollup = _rollup_entry(created_at[:10], analysis_type, results, confidence_score)
+        # Blocks when the queue is full, pushing back on callers instead of growing without bound
+        self._write_queue.put((analysis_row, self._claim_rows(analysis_id, results), rollup))
+        return analysis_id
+    
+    def _write_behind_loop(self):
+        """Collect queued rows into batches and commit each batch in one transaction."""
+        stopping = False
+        while not stopping:
+            item = self._write_queue.get()
+            if item is _STOP_WRITER:
+                self._write_queue.task_done()
+                break
+            
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._write_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP_WRITER:
+                    self._write_queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            self._write_batch(batch)
+            for _ in batch:
+                self._write_queue.task_done()
+        
+        # Drain anything queued behind the stop marker
+        remaining_items = []
+        while True:
+            try:
+                remaining_items.append(self._write_queue.get_nowait())
+            except queue.Empty:
+                break
+        if remaining_items:
+            self._write_batch([item for item in remaining_items if item is not _STOP_WRITER])
+            for _ in remaining_items:
+                self._write_queue.task_done()
+    
+    def _write_batch(self, batch):
+        """Insert a batch of queued analyses, falling back to one at a time on failure."""
+        if not batch:
+            return
+        try:
+            self._insert_rows(batch)
+        except sqlite3.Error as e:
+            print(f"Write-behind batch of {len(batch)} analyses failed, retrying individually: {e}")
+            for item in batch:
+                try:
+                    self._insert_rows([item])
+                except sqlite3.Error as item_error:
+                    print(f"Dropping analysis {item[0][0]} after write failure: {item_error}")
+                    with self._pool_lock:
+                        self._stats['write_errors'] += 1
+    
+    def _insert_rows(self, batch):
+        with self.connection() as conn:
+            conn.executemany('''
+            INSERT INTO analyses (id, text, analysis_type, results, created_at, source, confidence_score)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', [analysis_row for analysis_row, _, _ in batch])
+            self._insert_claims(conn, [claim_row for _, claim_rows, _ in batch for claim_row in claim_rows])
+            _add_to_rollups(conn, [rollup for _, _, rollup in batch])
+            conn.commit()
+        with self._pool_lock:
+            self._stats['rows_flushed'] += len(batch)
+            self._stats['batches_flushed'] += 1
+    
+    def get_analysis(self, analysis_id):
+        """
+        Retrieve a specific analysis by ID, with its claims, in one query.
+        Archives are only attached when the ID isn't in the hot database.
+        """
+        with self.connection() as conn:
+            analysis = self._select_analysis(conn, 'main', analysis_id)
+            if analysis is None:
+                for month, file_name in self._find_archives(conn, min_id=analysis_id, max_id=analysis_id):
+                    with self._attached_archive(conn, month, file_name) as schema:
+                        analysis = self._select_analysis(conn, schema, analysis_id)
+                    if analysis is not None:
+                        break
+        
+        if analysis is None:
+            return None
+        result = _analysis_record(analysis)
+        result['claims'] = [_claim_record(claim) for claim in json.loads(analysis[7])]
+        return result
+    
+    def _select_analysis(self, conn, schema, analysis_id):
+        return conn.execute(f'''
+        SELECT {ANALYSIS_COLUMNS},
+               (SELECT json_group_array(json_array({CLAIM_COLUMNS}))
+                FROM (SELECT * FROM {schema}.claims WHERE analysis_id = a.id ORDER BY id))
+        FROM {schema}.analyses a WHERE id = ?
+        ''', (analysis_id,)).fetchone()
+    
+    def get_analyses(self, analysis_ids, batch_size=500):
+        """
+        Retrieve many analyses with their claims, in the order the IDs were
+        given. IDs that don't exist are skipped and duplicates returned once.
+        Each batch of batch_size IDs costs two queries: analyses, then claims.
+        IDs missing from the hot database are looked up in the archives whose
+        ID range covers them.
+        """
+        analysis_ids = list(dict.fromkeys(analysis_ids))
+        found = {}
+        with self.connection() as conn:
+            self._select_analyses(conn, 'main', analysis_ids, batch_size, found)
+            missing = [analysis_id for analysis_id in analysis_ids if analysis_id not in found]
+            if missing:
+                for month, file_name in self._find_archives(conn, min_id=min(missing), max_id=max(missing)):
+                    with self._attached_archive(conn, month, file_name) as schema:
+                        self._select_analyses(conn, schema, missing, batch_size, found)
+                    missing = [analysis_id for analysis_id in missing if analysis_id not in found]
+                    if not missing:
+                        break
+        return [found[analysis_id] for analysis_id in analysis_ids if analysis_id in found]
+    
+    def _select_analyses(self, conn, schema, analysis_ids, batch_size, found):
+        for start in range(0, len(analysis_ids), batch_size):
+            batch = analysis_ids[start:start + batch_size]
+            placeholders = ', '.join('?' * len(batch))
+            for analysis in conn.execute(f'''
+            SELECT {ANALYSIS_COLUMNS} FROM {schema}.analyses WHERE id IN ({placeholders})
+            ''', batch):
+                found[analysis[0]] = _analysis_record(analysis)
+                found[analysis[0]]['claims'] = []
+            for claim in conn.execute(f'''
+            SELECT {CLAIM_COLUMNS} FROM {schema}.claims WHERE analysis_id IN ({placeholders}) ORDER BY id
+            ''', batch):
+                if claim[1] in found:
+                    found[claim[1]]['claims'].append(_claim_record(claim))
+    
+    def get_claim_verdict(self, claim, max_age, source=None):
+        """
+        Return the latest stored verification of a claim, or of any claim with
+        the same fingerprint, if it is at most max_age seconds old. With source
+        given, only that source's verdict is considered.
+        """
+        source_filter = '' if source is None else 'AND source = ?'
+        params = (claim_fingerprint(claim), f'-{float(max_age)} seconds') + (() if source is None else (source,))
+        with self.connection() as conn:
+            row = conn.execute(f'''
+            SELECT verification, source, verified_at FROM claim_verdicts
+            WHERE fingerprint = ? AND verified_at >= datetime('now', ?) {source_filter}
+            ORDER BY verified_at DESC LIMIT 1
+            ''', params).fetchone()
+        if row is None:
+            return None
+        return {
+            'verification': decode_results(row[0]),
+            'source': row[1],
+            'verified_at': row[2]
+        }
+    
+    def record_claim_verdict(self, claim, verification, source):
+        """Store a claim's verification as the latest verdict of its source for its fingerprint."""
+        fingerprint = claim_fingerprint(claim)
+        with self.connection() as conn:
+            conn.execute('''
+            INSERT OR IGNORE INTO claim_fingerprints (fingerprint, claim_text) VALUES (?, ?)
+            ''', (fingerprint, claim))
+            conn.execute('''
+            INSERT INTO claim_verdicts (fingerprint, source, verification, verified_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT (fingerprint, source) DO UPDATE SET
+                verification = excluded.verification,
+                verified_at = excluded.verified_at
+            ''', (fingerprint, source, encode_results(verification, self.compress_results)))
+            conn.commit()
+    
+    def iter_analyses(self, since_id=0, page_size=1000, include_claims=True):
+        """
+        Yield every analysis with an ID greater than since_id, in ID order.
+        
+        Rows are read in keyset pages of page_size, each page a separate query,
+        so memory stays flat regardless of table size and no read transaction
+        is held open while the caller consumes the rows. Results are yielded
+        as LazyResults and are only decoded if the caller touches them.
+        Archived analyses are included: each page also reads the archives
+        whose ID range overlaps it and merges their rows in ID order.
+        Raises ValueError if page_size is less than 1.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        return self._iter_analyses(since_id, page_size, include_claims)
+    
+    def _iter_analyses(self, since_id, page_size, include_claims):
+        last_id = since_id or 0
+        while True:
+            with self.connection() as conn:
+                page = self._select_page(conn, 'main', last_id, page_size, include_claims)
+                upper = max(page) if len(page) == page_size else None
+                for month, file_name in self._find_archives(conn, min_id=last_id + 1, max_id=upper):
+                    with self._attached_archive(conn, month, file_name) as schema:
+                        archived = self._select_page(conn, schema, last_id, page_size, include_claims, upper)
+                    # A row in both (an interrupted archive run) is read from the hot database
+                    archived.update(page)
+                    page = dict(sorted(archived.items())[:page_size])
+                    if len(page) == page_size:
+                        upper = max(page)
+            
+            if not page:
+                return
+            for analysis_id in sorted(page):
+                yield page[analysis_id]
+            last_id = max(page)
+    
+    def _select_page(self, conn, schema, after_id, page_size, include_claims, upper=None):
+        """Select up to page_size analyses of one schema with IDs after after_id (and up to upper), keyed by ID."""
+        bound = '' if upper is None else 'AND id <= ?'
+        params = (after_id,) + (() if upper is None else (upper,)) + (page_size,)
+        rows = conn.execute(f'''
+        SELECT {ANALYSIS_COLUMNS} FROM {schema}.analyses WHERE id > ? {bound} ORDER BY id LIMIT ?
+        ''', params).fetchall()
+        page = {}
+        for row in rows:
+            page[row[0]] = _analysis_record(row)
+            if include_claims:
+                page[row[0]]['claims'] = []
+        if include_claims and rows:
+            for claim in conn.execute(f'''
+            SELECT {CLAIM_COLUMNS} FROM {schema}.claims WHERE analysis_id BETWEEN ? AND ? ORDER BY id
+            ''', (rows[0][0], rows[-1][0])):
+                if claim[1] in page:
+                    page[claim[1]]['claims'].append(_claim_record(claim))
+        return page
+    
+    def get_stats(self, start=None, end=None, analysis_type=None):
+        """
+        Daily analysis statistics between the start and end days (inclusive,
+        'YYYY-MM-DD' in UTC), read from the rollup tables only. Returns one
+        entry per day and analysis type, plus totals per analysis type.
+        """
+        conditions = []
+        params = []
+        if start is not None:
+            conditions.append('day >= ?')
+            params.append(start)
+        if end is not None:
+            conditions.append('day <= ?')
+            params.append(end)
+        if analysis_type is not None:
+            conditions.append('analysis_type = ?')
+            params.append(analysis_type)
+        where = ('WHERE ' + ' AND '.join(conditions)) if conditions else ''
+        
+        with self.connection() as conn:
+            rows = conn.execute(f'''
+            SELECT day, analysis_type, analyses, confidence_sum, confidence_count, claims
+            FROM daily_analysis_stats {where} ORDER BY day, analysis_type
+            ''', params).fetchall()
+            status_rows = conn.execute(f'''
+            SELECT day, analysis_type, status, count FROM daily_status_stats {where}
+            ''', params).fetchall()
+        
+        days = {}
+        totals = {}
+        confidence = {}
+        for day, row_type, analyses, confidence_sum, confidence_count, claims in rows:
+            days[(day, row_type)] = {
+                'day': day,
+                'analysis_type': row_type,
+                'analyses': analyses,
+                'claims': claims,
+                'average_confidence': confidence_sum / confidence_count if confidence_count else None,
+                'statuses': {}
+            }
+            total = totals.setdefault(row_type, {'analyses': 0, 'claims': 0, 'statuses': {}})
+            total['analyses'] += analyses
+            total['claims'] += claims
+            type_sum, type_count = confidence.get(row_type, (0.0, 0))
+            confidence[row_type] = (type_sum + confidence_sum, type_count + confidence_count)
+        for day, row_type, status, count in status_rows:
+            days[(day, row_type)]['statuses'][status] = count
+            statuses = totals[row_type]['statuses']
+            statuses[status] = statuses.get(status, 0) + count
+        for row_type, (confidence_sum, confidence_count) in confidence.items():
+            totals[row_type]['average_confidence'] = confidence_sum / confidence_count if confidence_count else None
+        
+        return {'days': list(days.values()), 'totals': totals}
+    
+    def rebuild_stats(self):
+        """
+        Recompute the daily statistics rollups from scratch, from the hot
+        database and every registered archive file.
+        """
+        with self.connection() as conn:
+            archive_paths = [os.path.join(self.archive_dir, file_name)
+                             for _, file_name in self._find_archives(conn)]
+            _rebuild_rollups(conn, archive_paths=archive_paths)
+            conn.commit()
+    
+    def compress_existing_results(self, batch_size=1000):
+        """
+        Rewrite results stored as plain JSON text into the compressed format,
+        one batch per transaction so the writer lock is never held for long.
+        Returns the number of rows rewritten.
+        """
+        rewritten = 0
+        last_id = 0
+        while True:
+            with self.connection() as conn:
+                rows = conn.execute('''
+                SELECT id, results FROM analyses
+                WHERE id > ? AND typeof(results) = 'text'
+                ORDER BY id LIMIT ?
+                ''', (last_id, batch_size)).fetchall()
+                if not rows:
+                    break
+                conn.executemany('''
+                UPDATE analyses SET results = ? WHERE id = ?
+                ''', [(encode_results(json.loads(results)), analysis_id) for analysis_id, results in rows])
+                conn.commit()
+            rewritten += len(rows)
+            last_id = rows[-1][0]
+        return rewritten
+    
+    def search(self, query, limit=20, offset=0, kind=None, start=None, end=None):
+        """
+        Full-text search over analysis text and claim text, best matches first.
+        
+        Every word of the query must match; words are treated as literals, not
+        FTS5 syntax. kind can be 'analysis' or 'claim' to search only one of them.
+        Each hit carries a snippet with matched terms wrapped in <mark> tags.
+        
+        start and end ('YYYY-MM-DD', end day inclusive) restrict hits to analyses
+        created in that range. Archived months are only searched when a range
+        is given that reaches into them.
+        """
+        match = ' '.join('"' + term.replace('"', '""') + '"' for term in query.split())
+        if not match:
+            return []
+        
+        time_filter = ''
+        time_params = ()
+        if start is not None:
+            time_filter += ' AND a.created_at >= ?'
+            time_params += (start,)
+        if end is not None:
+            time_filter += " AND a.created_at < date(?, '+1 day')"
+            time_params += (end,)
+        
+        def ranked_sql(hit_kind, schema):
+            if hit_kind == 'analysis':
+                if not time_filter:
+                    return (f"SELECT 'analysis', rowid, rank FROM {schema}.analyses_fts "
+                            f"WHERE analyses_fts MATCH ? ORDER BY rank LIMIT ?")
+                return (f"SELECT 'analysis', analyses_fts.rowid, analyses_fts.rank FROM {schema}.analyses_fts "
+                        f"JOIN {schema}.analyses a ON a.id = analyses_fts.rowid "
+                        f"WHERE analyses_fts MATCH ?{time_filter} ORDER BY analyses_fts.rank LIMIT ?")
+            if not time_filter:
+                return (f"SELECT 'claim', rowid, rank FROM {schema}.claims_fts "
+                        f"WHERE claims_fts MATCH ? ORDER BY rank LIMIT ?")
+            return (f"SELECT 'claim', claims_fts.rowid, claims_fts.rank FROM {schema}.claims_fts "
+                    f"JOIN {schema}.claims c ON c.id = claims_fts.rowid "
+                    f"JOIN {schema}.analyses a ON a.id = c.analysis_id "
+                    f"WHERE claims_fts MATCH ?{time_filter} ORDER BY claims_fts.rank LIMIT ?")
+        
+        # Rank each table with FTS5's own ORDER BY rank LIMIT, which only keeps the
+        # top rows, then merge; snippets are only built for the requested page
+        window = offset + limit
+        kinds = [kind] if kind in ('analysis', 'claim') else ['analysis', 'claim']
+        params = (match,) + time_params + (window,)
+        
+        def ranked_hits(conn, schema, archive):
+            sql = ' UNION ALL '.join(f'SELECT * FROM ({ranked_sql(name, schema)})' for name in kinds)
+            return [(archive,) + hit for hit in conn.execute(sql + ' ORDER BY 3 LIMIT ?',
+                                                              params * len(kinds) + (window,))]
+        
+        def snippet_row(conn, schema, hit_kind, rowid):
+            if hit_kind == 'analysis':
+                return conn.execute(f'''
+                SELECT a.id, NULL, a.analysis_type, a.created_at,
+                       snippet(analyses_fts, 0, ?, ?, '...', 16)
+                FROM {schema}.analyses_fts JOIN {schema}.analyses a ON a.id = analyses_fts.rowid
+                WHERE analyses_fts MATCH ? AND analyses_fts.rowid = ?
+                ''', (SNIPPET_START, SNIPPET_END, match, rowid)).fetchone()
+            return conn.execute(f'''
+            SELECT c.analysis_id, c.id, a.analysis_type, a.created_at,
+                   snippet(claims_fts, 0, ?, ?, '...', 16)
+            FROM {schema}.claims_fts JOIN {schema}.claims c ON c.id = claims_fts.rowid
+            JOIN {schema}.analyses a ON a.id = c.analysis_id
+            WHERE claims_fts MATCH ? AND claims_fts.rowid = ?
+            ''', (SNIPPET_START, SNIPPET_END, match, rowid)).fetchone()
+        
+        with self.connection() as conn:
+            hits = ranked_hits(conn, 'main', None)
+            archives = self._find_archives(conn, start=start, end=end) if start or end else []
+            # Archives are attached one at a time, so any number of months can be searched
+            for archive in archives:
+                with self._attached_archive(conn, *archive) as schema:
+                    hits.extend(ranked_hits(conn, schema, archive))
+            hits.sort(key=lambda hit: hit[3])
+            page = hits[offset:offset + limit]
+            
+            rows = {}
+            for archive in [None] + archives:
+                archive_hits = [hit for hit in page if hit[0] == archive]
+                if not archive_hits:
+                    continue
+                if archive is None:
+                    for hit in archive_hits:
+                        rows[hit] = snippet_row(conn, 'main', hit[1], hit[2])
+                else:
+                    with self._attached_archive(conn, *archive) as schema:
+                        for hit in archive_hits:
+                            rows[hit] = snippet_row(conn, schema, hit[1], hit[2])
+        
+        results = []
+        for hit in page:
+            row = rows[hit]
+            if row is None:
+                continue
+            results.append({
+                'kind': hit[1],
+                'analysis_id': row[0],
+                'claim_id': row[1],
+                'analysis_type': row[2],
+                'created_at': row[3],
+                'snippet': row[4],
+                'rank': hit[3],
+                'archived': hit[0] is not None
+            })
+        return results
+    
+    def archive_analyses(self, older_than_days, batch_size=500):
+        """
+        Move analyses created more than older_than_days days ago, with their
+        claims, out of the hot database into one archive file per month under
+        archive_dir, and register each file's ID and time range. Each batch is
+        copied, then deleted from the hot database, so an interrupted run can
+        simply be repeated. Returns the number of analyses archived per month.
+        """
+        os.makedirs(self.archive_dir, exist_ok=True)
+        archived = {}
+        with self.connection() as conn:
+            cutoff = conn.execute("SELECT datetime('now', ?)", (f'-{int(older_than_days)} days',)).fetchone()[0]
+            months = [row[0] for row in conn.execute('''
+            SELECT DISTINCT strftime('%Y-%m', created_at) FROM analyses
+            WHERE created_at < ? AND created_at IS NOT NULL
+            ''', (cutoff,))]
+            
+            for month in months:
+                file_name = f'analyses-{month}.db'
+                self._init_archive(os.path.join(self.archive_dir, file_name))
+                month_start = f'{month}-01'
+                with self._attached_archive(conn, month, file_name) as schema:
+                    while True:
+                        ids = [row[0] for row in conn.execute('''
+                        SELECT id FROM main.analyses
+                        WHERE created_at >= ? AND created_at < date(?, '+1 month') AND created_at < ?
+                        ORDER BY created_at, id LIMIT ?
+                        ''', (month_start, month_start, cutoff, batch_size))]
+                        if not ids:
+                            break
+                        placeholders = ', '.join('?' * len(ids))
+                        conn.execute(f'''
+                        INSERT OR IGNORE INTO {schema}.analyses ({ANALYSIS_COLUMNS})
+                        SELECT {ANALYSIS_COLUMNS} FROM main.analyses WHERE id IN ({placeholders})
+                        ''', ids)
+                        conn.execute(f'''
+                        INSERT OR IGNORE INTO {schema}.claims ({CLAIM_COLUMNS})
+                        SELECT {CLAIM_COLUMNS} FROM main.claims WHERE analysis_id IN ({placeholders})
+                        ''', ids)
+                        conn.execute(f'''
+                        DELETE FROM main.claims WHERE analysis_id IN ({placeholders})
+                        ''', ids)
+                        conn.execute(f'''
+                        DELETE FROM main.analyses WHERE id IN ({placeholders})
+                        ''', ids)
+                        conn.commit()
+                        archived[month] = archived.get(month, 0) + len(ids)
+                    
+                    bounds = conn.execute(f'''
+                    SELECT COUNT(*), MIN(id), MAX(id), MIN(created_at), MAX(created_at) FROM {schema}.analyses
+                    ''').fetchone()
+                    conn.execute('''
+                    INSERT INTO archives (month, file_name, analyses, min_id, max_id,
+                                          min_created_at, max_created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (month) DO UPDATE SET
+                        file_name = excluded.file_name,
+                        analyses = excluded.analyses,
+                        min_id = excluded.min_id,
+                        max_id = excluded.max_id,
+                        min_created_at = excluded.min_created_at,
+                        max_created_at = excluded.max_created_at
+                    ''', (month, file_name) + bounds)
+                    conn.commit()
+        return archived
+    
+    def _init_archive(self, path):
+        """Create the schema of an archive file that doesn't have one yet."""
+        conn = sqlite3.connect(path)
+        try:
+            if conn.execute('PRAGMA user_version').fetchone()[0] == 0:
+                for statement in ARCHIVE_SCHEMA:
+                    conn.execute(statement)
+                conn.execute('PRAGMA user_version = 1')
+                conn.commit()
+        finally:
+            conn.close()
+    
+    def _find_archives(self, conn, min_id=None, max_id=None, start=None, end=None):
+        """
+        Return (month, file_name) of the registered archives that may hold IDs
+        between min_id and max_id, or analyses created between start and end.
+        """
+        conditions = []
+        params = []
+        if min_id is not None:
+            conditions.append('max_id >= ?')
+            params.append(min_id)
+        if max_id is not None:
+            conditions.append('min_id <= ?')
+            params.append(max_id)
+        if start is not None:
+            conditions.append('max_created_at >= ?')
+            params.append(start)
+        if end is not None:
+            conditions.append("min_created_at < date(?, '+1 day')")
+            params.append(end)
+        where = ('WHERE ' + ' AND '.join(conditions)) if conditions else ''
+        archives = conn.execute(f'SELECT month, file_name FROM archives {where} ORDER BY month', params).fetchall()
+        # ATTACH would silently create an empty file for an archive that went missing
+        return [archive for archive in archives if os.path.exists(os.path.join(self.archive_dir, archive[1]))]
+    
+    def _created_at(self, conn, analysis_id):
+        """Look up an analysis's created_at in the hot database, then in the archives."""
+        row = conn.execute('SELECT created_at FROM analyses WHERE id = ?', (analysis_id,)).fetchone()
+        if row is not None:
+            return row[0]
+        for month, file_name in self._find_archives(conn, min_id=analysis_id, max_id=analysis_id):
+            with self._attached_archive(conn, month, file_name) as schema:
+                row = conn.execute(f'SELECT created_at FROM {schema}.analyses WHERE id = ?',
+                                   (analysis_id,)).fetchone()
+            if row is not None:
+                return row[0]
+        return None
+    
+    @contextmanager
+    def _attached_archive(self, conn, month, file_name):
+        """Attach a monthly archive file to a connection for the duration of the block."""
+        schema = 'archive_' + month.replace('-', '_')
+        conn.execute(f'ATTACH DATABASE ? AS {schema}', (os.path.join(self.archive_dir, file_name),))
+        try:
+            yield schema
+        finally:
+            conn.execute(f'DETACH DATABASE {schema}')
+    
+    def get_recent_analyses(self, limit=10, before_id=None, before_ts=None, summary=False,
+                            preview_length=200):
+        """
+        Get the most recent analyses, newest first.
+        
+        Pass the created_at and id of the last row of a page as before_ts and
+        before_id to get the next page (keyset pagination), so deep pages cost
+        the same as the first one. If only before_id is given, its timestamp is
+        looked up; if only before_ts is given, rows strictly older are returned.
+        
+        With summary=True only list-view fields are selected: the results blob
+        is never read or decoded, and text is cut to preview_length characters
+        in SQL. Use get_analysis to load the full record.
+        
+        Once a page reaches past the hot database, it continues into the monthly
+        archives, newest month first, attaching only those that can contribute.
+        """
+        if summary:
+            columns = 'id, analysis_type, created_at, source, confidence_score, substr(text, 1, ?), length(text)'
+            column_params = (preview_length,)
+        else:
+            columns = ANALYSIS_COLUMNS
+            column_params = ()
+        
+        with self.connection() as conn:
+            if before_id is not None and before_ts is None:
+                before_ts = self._created_at(conn, before_id)
+                if before_ts is None:
+                    return []
+            
+            if before_ts is not None and before_id is not None:
+                where = 'WHERE (created_at, id) < (?, ?)'
+                where_params = (before_ts, before_id)
+            elif before_ts is not None:
+                where = 'WHERE created_at < ?'
+                where_params = (before_ts,)
+            else:
+                where = ''
+                where_params = ()
+            
+            def select_page(schema):
+                return conn.execute(f'''
+                SELECT {columns} FROM {schema}.analyses {where}
+                ORDER BY created_at DESC, id DESC LIMIT ?
+                ''', column_params + where_params + (limit,)).fetchall()
+            
+            analyses = select_page('main')
+            
+            created_at = 2 if summary else 4
+            archives = conn.execute('''
+            SELECT month, file_name, max_created_at FROM archives
+            WHERE ? IS NULL OR min_created_at <= ? ORDER BY month DESC
+            ''', (before_ts, before_ts)).fetchall()
+            for month, file_name, max_created_at in archives:
+                # Months are disjoint, so once the page is full no older month can contribute
+                if len(analyses) >= limit and max_created_at < (analyses[-1][created_at] or ''):
+                    break
+                if not os.path.exists(os.path.join(self.archive_dir, file_name)):
+                    continue
+                with self._attached_archive(conn, month, file_name) as schema:
+                    archived = select_page(schema)
+                seen = {analysis[0] for analysis in analyses}
+                analyses = sorted(analyses + [analysis for analysis in archived if analysis[0] not in seen],
+                                  key=lambda analysis: (analysis[created_at] or '', analysis[0]), reverse=True)[:limit]
+            
+            if summary:
+                result = [{
+                    'id': analysis[0],
+                    'analysis_type': analysis[1],
+                    'created_at': analysis[2],
+                    'source': analysis[3],
+                    'confidence_score': analysis[4],
+                    'text_preview': analysis[5],
+                    'text_truncated': analysis[6] > preview_length
+                } for analysis in analyses]
+            else:
+                result = [_analysis_record(analysis) for analysis in analyses]
+        return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DebateSphere database maintenance.")
+    parser.add_argument('--db', default="debatesphere.db", help="Path of the database file")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    compress_parser = subparsers.add_parser('compress-results',
+                                            help="Compress results stored as plain JSON text")
+    compress_parser.add_argument('--batch-size', type=int, default=1000)
+    compress_parser.add_argument('--vacuum', action='store_true',
+                                 help="VACUUM afterwards to return freed pages to the filesystem")
+    
+    stats_parser = subparsers.add_parser('rebuild-stats', help="Recompute the daily statistics rollups")
+    stats_parser.add_argument('--archive-dir', help="Directory of the archive files")
+    
+    archive_parser = subparsers.add_parser('archive',
+                                           help="Move old analyses into monthly archive files")
+    archive_parser.add_argument('--older-than-days', type=int, required=True)
+    archive_parser.add_argument('--archive-dir', help="Directory of the archive files")
+    archive_parser.add_argument('--batch-size', type=int, default=500)
+    archive_parser.add_argument('--vacuum', action='store_true',
+                                help="VACUUM afterwards to shrink the hot database file")
+    
+    export_parser = subparsers.add_parser('export', help="Export analyses as newline-delimited JSON")
+    export_parser.add_argument('--since-id', type=int, default=0,
+                               help="Only export analyses with a greater ID (incremental export)")
+    export_parser.add_argument('--output', '-o', help="File to write (default: standard output)")
+    export_parser.add_argument('--gzip', action='store_true', help="Gzip-compress the output")
+    export_parser.add_argument('--page-size', type=int, default=1000)
+    
+    args = parser.parse_args(argv)
+    db = Database(args.db, archive_dir=getattr(args, 'archive_dir', None))
+    try:
+        if args.command == 'compress-results':
+            count = db.compress_existing_results(args.batch_size)
+            print(f"Compressed results of {count} analyses")
+            if args.vacuum:
+                with db.connection() as conn:
+                    conn.execute('VACUUM')
+        elif args.command == 'rebuild-stats':
+            db.rebuild_stats()
+            print("Rebuilt daily statistics")
+        elif args.command == 'archive':
+            archived = db.archive_analyses(args.older_than_days, args.batch_size)
+            for month, count in sorted(archived.items()):
+                print(f"Archived {count} analyses from {month}")
+            if args.vacuum:
+                with db.connection() as conn:
+                    conn.execute('VACUUM')
+        elif args.command == 'export':
+            if args.output:
+                out = gzip.open(args.output, 'wt', encoding='utf-8') if args.gzip else open(args.output, 'w', encoding='utf-8')
+            elif args.gzip:
+                out = gzip.open(sys.stdout.buffer, 'wt', encoding='utf-8')
+            else:
+                out = sys.stdout
+            count = 0
+            last_id = args.since_id
+            try:
+                for analysis in db.iter_analyses(args.since_id, args.page_size):
+                    out.write(ndjson_line(analysis))
+                    count += 1
+                    last_id = analysis['id']
+            finally:
+                if out is not sys.stdout:
+                    out.close()
+            print(f"Exported {count} analyses (last id {last_id})", file=sys.stderr)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
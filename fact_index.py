@@ -0,0 +1,163 @@
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    from nltk.corpus import stopwords
+    STOPWORDS = frozenset(stopwords.words('english'))
+except LookupError:
+    # NLTK stopwords corpus not downloaded yet; fall back to a small built-in list
+    STOPWORDS = frozenset("""
+        a about above after again against all am an and any are as at be because been
+        before being below between both but by can did do does doing down during each
+        few for from further had has have having he her here hers herself him himself
+        his how i if in into is it its itself just me more most my myself no nor not now
+        of off on once only or other our ours ourselves out over own same she should so
+        some such than that the their theirs them themselves then there these they this
+        those through to too under until up very was we were what when where which while
+        who whom why will with you your yours yourself yourselves
+    """.split())
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:['\-][a-z0-9]+)*")
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase terms, dropping stopwords."""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+class FactIndex:
+    """
+    An in-memory inverted index over fact sentences, ranked with BM25.
+    
+    Facts can be added and removed at any time; document frequencies and
+    lengths are kept up to date incrementally, so there is never a full rebuild.
+    """
+    
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        Initialize an empty index.
+        
+        Args:
+            k1: BM25 term-frequency saturation parameter
+            b: BM25 document-length normalization parameter
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._documents: List[Optional[Dict[str, Any]]] = []
+        self._lengths: List[int] = []
+        self._total_length = 0
+        self._count = 0
+        self._doc_ids: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def add_fact(self, topic: str, fact: str) -> Optional[int]:
+        """
+        Index a single fact under a topic.
+        
+        Args:
+            topic: The topic the fact belongs to
+            fact: The fact sentence
+        
+        Returns:
+            The document ID of the fact, or None if it was already indexed
+        """
+        terms = Counter(tokenize(fact))
+        with self._lock:
+            if (topic, fact) in self._doc_ids:
+                return None
+            
+            doc_id = len(self._documents)
+            self._doc_ids[(topic, fact)] = doc_id
+            self._documents.append({"topic": topic, "fact": fact})
+            length = sum(terms.values())
+            self._lengths.append(length)
+            self._total_length += length
+            self._count += 1
+            for term, frequency in terms.items():
+                self._postings.setdefault(term, {})[doc_id] = frequency
+        return doc_id
+    
+    def remove_fact(self, topic: str, fact: str) -> bool:
+        """
+        Remove a fact from the index.
+        
+        Args:
+            topic: The topic the fact was indexed under
+            fact: The fact sentence
+        
+        Returns:
+            True if the fact was indexed
+        """
+        terms = set(tokenize(fact))
+        with self._lock:
+            doc_id = self._doc_ids.pop((topic, fact), None)
+            if doc_id is None:
+                return False
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is not None:
+                    postings.pop(doc_id, None)
+                    if not postings:
+                        del self._postings[term]
+            self._documents[doc_id] = None
+            self._total_length -= self._lengths[doc_id]
+            self._lengths[doc_id] = 0
+            self._count -= 1
+        return True
+    
+    def add_facts_table(self, table: Dict[str, Dict[str, Any]]):
+        """
+        Index every fact of a topic table shaped like FACT_DATABASE or KNOWN_FACTS.
+        
+        Args:
+            table: Dictionary mapping topics to dictionaries with a "facts" list
+        """
+        for topic, data in table.items():
+            for fact in data.get("facts", []):
+                self.add_fact(topic, fact)
+    
+    def search(self, query: str, k: int = 5, topic: Optional[str] = None,
+               min_score: float = 0.0) -> List[Dict[str, Any]]:
+        """
+        Rank indexed facts against a query with BM25.
+        
+        Args:
+            query: The text to search for, typically a claim
+            k: Maximum number of results to return
+            topic: Only return facts from this topic (None searches all topics)
+            min_score: Drop results scoring below this threshold
+        
+        Returns:
+            List of dictionaries with fact, topic and score, best first
+        """
+        terms = set(tokenize(query))
+        scores: Dict[int, float] = {}
+        with self._lock:
+            count = self._count
+            if not count or not terms:
+                return []
+            average_length = self._total_length / count
+            
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings.items():
+                    if topic is not None and self._documents[doc_id]["topic"] != topic:
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+            
+            ranked = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            return [{
+                "fact": self._documents[doc_id]["fact"],
+                "topic": self._documents[doc_id]["topic"],
+                "score": round(score, 4)
+            } for doc_id, score in ranked if score >= min_score]
@@ -0,0 +1,103 @@
+import hashlib
+import json
+from typing import Dict, Any, List, Optional
+from sqlite_cache import SQLiteLRUCache
+
+def request_key(model: str, messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> str:
+    """Hash the parameters that determine a chat completion into a cache key."""
+    payload = json.dumps({
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class GPTResponseCache(SQLiteLRUCache):
+    """
+    A persistent, content-addressed SQLite cache of chat completion responses.
+    
+    Entries are keyed on a hash of the request (see request_key), expire after
+    a TTL and are kept under a maximum count by evicting the least recently
+    used rows. The original call's latency and token usage are stored with
+    each response, so hits can report how much time and how many tokens they saved.
+    """
+    
+    table = "gpt_response_cache"
+    key_column = "request_key"
+    columns = {
+        "model": "TEXT NOT NULL",
+        "content": "TEXT NOT NULL",
+        "latency": "REAL NOT NULL",
+        "total_tokens": "INTEGER"
+    }
+    
+    def __init__(self, db_path: str = "gpt_cache.db", ttl: float = 24 * 3600,
+                 max_entries: int = 20000):
+        """
+        Initialize the cache and create its table if needed.
+        
+        Args:
+            db_path: Path of the SQLite file holding the cache
+            ttl: Seconds a cached response stays valid
+            max_entries: Maximum number of cached responses before LRU eviction
+        """
+        self.bypassed = 0
+        self.saved_seconds = 0.0
+        self.saved_tokens = 0
+        super().__init__(db_path, ttl, max_entries)
+    
+    def on_hit(self, row: Dict[str, Any]):
+        self.saved_seconds += row["latency"]
+        self.saved_tokens += row["total_tokens"] or 0
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+        
+        Args:
+            key: The request key from request_key
+        
+        Returns:
+            Dictionary with content, latency and total_tokens, or None on a miss
+        """
+        row = self.get_row(key)
+        if row is None:
+            return None
+        return {
+            "content": row["content"],
+            "latency": row["latency"],
+            "total_tokens": row["total_tokens"]
+        }
+    
+    def put(self, key: str, model: str, content: str, latency: float,
+            total_tokens: Optional[int] = None):
+        """
+        Store a response.
+        
+        Args:
+            key: The request key from request_key
+            model: The model that produced the response
+            content: The response message content
+            latency: Seconds the original API call took
+            total_tokens: Tokens the original API call consumed, if known
+        """
+        self.put_row(key, {
+            "model": model,
+            "content": content,
+            "latency": latency,
+            "total_tokens": total_tokens
+        })
+    
+    def record_bypass(self):
+        """Count a lookup that skipped the cache on request."""
+        with self._lock:
+            self.bypassed += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters, saved latency and tokens, and the current cache size."""
+        stats = super().stats()
+        stats["bypassed"] = self.bypassed
+        stats["saved_seconds"] = round(self.saved_seconds, 3)
+        stats["saved_tokens"] = self.saved_tokens
+        return stats
@@ -0,0 +1,330 @@
+import asyncio
+import concurrent.futures
+import queue
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List
+
+import aiohttp
+import openai
+
+# Errors worth retrying: rate limits and transient server or network failures
+RETRYABLE_ERRORS = (
+    openai.error.RateLimitError,
+    openai.error.ServiceUnavailableError,
+    openai.error.APIConnectionError,
+    openai.error.Timeout,
+    openai.error.TryAgain
+)
+
+def estimate_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+    """Roughly estimate a request's tokens: ~4 characters per prompt token plus the completion budget."""
+    return sum(len(message.get("content", "")) for message in messages) // 4 + max_tokens
+
+class TokenBucket:
+    """
+    A bucket holding up to capacity units that refills continuously at
+    capacity units per minute.
+    """
+    
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.available = per_minute
+        self._updated = time.monotonic()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount units are available (0 if they are now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.rate
+    
+    def take(self, amount: float):
+        """Remove units from the bucket; a negative amount returns units."""
+        self._refill()
+        self.available = min(self.capacity, self.available - min(amount, self.capacity))
+
+class RateLimiter:
+    """
+    Token-bucket limiter on both requests per minute and tokens per minute.
+    
+    It must only be used from the event loop it was created for, which keeps
+    checking and taking from both buckets atomic without any locking.
+    """
+    
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        """
+        Initialize the limiter.
+        
+        Args:
+            requests_per_minute: Maximum sustained request rate
+            tokens_per_minute: Maximum sustained token rate
+        """
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.throttled_seconds = 0.0
+    
+    async def acquire(self, tokens: int):
+        """
+        Wait until one request and the estimated tokens fit in both buckets, then take them.
+        
+        Args:
+            tokens: Estimated tokens of the request
+        """
+        while True:
+            wait = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+            if wait <= 0:
+                self.requests.take(1)
+                self.tokens.take(tokens)
+                return
+            self.throttled_seconds += wait
+            await asyncio.sleep(wait)
+    
+    def adjust(self, tokens: int):
+        """
+        Correct the token bucket once the actual usage of a request is known.
+        
+        Args:
+            tokens: Actual minus estimated tokens (negative returns unused tokens)
+        """
+        self.tokens.take(tokens)
+
+class AsyncGPTClient:
+    """
+    An asynchronous chat completion client running on its own event loop thread.
+    
+    All calls share one aiohttp connection pool, at most max_concurrency
+    requests are in flight at once, and a token-bucket limiter keeps
+    requests and tokens under the configured per-minute limits. Rate limit
+    (429) and server (5xx) errors are retried with jittered exponential backoff.
+    Synchronous code calls run or stream, which block on the loop thread.
+    """
+    
+    def __init__(self, max_concurrency: int = 8, requests_per_minute: float = 60,
+                 tokens_per_minute: float = 40000, max_retries: int = 5,
+                 base_delay: float = 1.0, max_delay: float = 30.0, timeout: float = 120.0):
+        """
+        Initialize the client. The event loop thread is started on first use.
+        
+        Args:
+            max_concurrency: Maximum number of requests in flight
+            requests_per_minute: Request rate limit enforced client-side
+            tokens_per_minute: Token rate limit enforced client-side
+            max_retries: Retries of a request after a retryable error
+            base_delay: Backoff cap in seconds for the first retry, doubled on each retry
+            max_delay: Upper bound in seconds of any backoff
+            timeout: Seconds a synchronous caller waits for a result
+        """
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.stats = {"requests": 0, "retries": 0, "failures": 0, "in_flight": 0}
+        self._loop = None
+        self._thread = None
+        self._session = None
+        self._semaphore = None
+        self._limiter = None
+        self._start_lock = threading.Lock()
+    
+    def _ensure_loop(self):
+        with self._start_lock:
+            if self._loop is not None:
+                return
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever,
+                                            name='gpt-client-loop', daemon=True)
+            self._thread.start()
+            asyncio.run_coroutine_threadsafe(self._setup(), self._loop).result()
+    
+    async def _setup(self):
+        # Created on the loop they are used from
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_concurrency)
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._limiter = RateLimiter(self.requests_per_minute, self.tokens_per_minute)
+    
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Full-jitter exponential backoff, honouring a Retry-After header when given."""
+        retry_after = (getattr(error, "headers", None) or {}).get("retry-after")
+        if retry_after:
+            try:
+                return min(self.max_delay, float(retry_after)) + random.uniform(0, self.base_delay)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+    
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        if isinstance(error, RETRYABLE_ERRORS):
+            return True
+        status = getattr(error, "http_status", None)
+        return isinstance(error, openai.error.APIError) and status is not None and status >= 500
+    
+    async def chat_completion(self, **params) -> Any:
+        """
+        Create a chat completion, waiting for rate limit capacity and retrying transient errors.
+        
+        Args:
+            **params: Parameters for openai.ChatCompletion (model, messages, temperature, max_tokens)
+        
+        Returns:
+            The API response object
+        """
+        estimate = estimate_tokens(params.get("messages", []), params.get("max_tokens") or 0)
+        attempt = 0
+        while True:
+            await self._limiter.acquire(estimate)
+            async with self._semaphore:
+                openai.aiosession.set(self._session)
+                self.stats["requests"] += 1
+                self.stats["in_flight"] += 1
+                try:
+                    response = await openai.ChatCompletion.acreate(**params)
+                except Exception as e:
+                    if not self._is_retryable(e) or attempt >= self.max_retries:
+                        self.stats["failures"] += 1
+                        raise
+                    error = e
+                else:
+                    usage = response.get("usage") or {}
+                    if usage.get("total_tokens"):
+                        self._limiter.adjust(usage["total_tokens"] - estimate)
+                    return response
+                finally:
+                    self.stats["in_flight"] -= 1
+            
+            self.stats["retries"] += 1
+            await asyncio.sleep(self._backoff(attempt, error))
+            attempt += 1
+    
+    async def stream_chat_completion(self, **params) -> AsyncIterator[Any]:
+        """
+        Create a streamed chat completion, yielding response chunks as they arrive.
+        
+        The request waits for rate limit capacity and holds a concurrency slot
+        until the stream ends. Errors before the first chunk are retried like in
+        chat_completion; a stream that fails midway raises, since its earlier
+        chunks have already been delivered.
+        
+        Args:
+            **params: Parameters for openai.ChatCompletion (model, messages, temperature, max_tokens)
+        """
+        estimate = estimate_tokens(params.get("messages", []), params.get("max_tokens") or 0)
+        attempt = 0
+        while True:
+            await self._limiter.acquire(estimate)
+            async with self._semaphore:
+                openai.aiosession.set(self._session)
+                self.stats["requests"] += 1
+                self.stats["in_flight"] += 1
+                received = False
+                try:
+                    response = await openai.ChatCompletion.acreate(stream=True, **params)
+                    async for chunk in response:
+                        received = True
+                        yield chunk
+                    return
+                except Exception as e:
+                    if received or not self._is_retryable(e) or attempt >= self.max_retries:
+                        self.stats["failures"] += 1
+                        raise
+                    error = e
+                finally:
+                    self.stats["in_flight"] -= 1
+            
+            self.stats["retries"] += 1
+            await asyncio.sleep(self._backoff(attempt, error))
+            attempt += 1
+    
+    def stream(self, **params) -> Iterator[Any]:
+        """
+        Synchronous wrapper around stream_chat_completion for threaded callers.
+        Closing the iterator early cancels the request.
+        
+        Args:
+            **params: Parameters for openai.ChatCompletion
+        
+        Yields:
+            Response chunks as they arrive
+        """
+        self._ensure_loop()
+        chunks = queue.Queue()
+        done = object()
+        
+        async def pump():
+            stream = self.stream_chat_completion(**params)
+            try:
+                async for chunk in stream:
+                    chunks.put(chunk)
+                chunks.put(done)
+            except Exception as e:
+                chunks.put(e)
+            finally:
+                await stream.aclose()
+        
+        future = asyncio.run_coroutine_threadsafe(pump(), self._loop)
+        try:
+            while True:
+                try:
+                    item = chunks.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise TimeoutError(f"No response chunk received within {self.timeout}s")
+                if item is done:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            future.cancel()
+    
+    def run(self, **params) -> Any:
+        """
+        Synchronous wrapper around chat_completion for threaded callers.
+        
+        Args:
+            **params: Parameters for openai.ChatCompletion
+        
+        Returns:
+            The API response object
+        """
+        self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(self.chat_completion(**params), self._loop)
+        try:
+            return future.result(self.timeout)
+        except concurrent.futures.TimeoutError:
+            # Stop the request instead of letting it use up rate limit quota for nobody
+            future.cancel()
+            raise
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return request, retry and throttling counters."""
+        stats = dict(self.stats)
+        stats["throttled_seconds"] = round(self._limiter.throttled_seconds, 3) if self._limiter else 0.0
+        stats["max_concurrency"] = self.max_concurrency
+        stats["requests_per_minute"] = self.requests_per_minute
+        stats["tokens_per_minute"] = self.tokens_per_minute
+        return stats
+    
+    def close(self):
+        """Close the connection pool and stop the event loop thread."""
+        with self._start_lock:
+            if self._loop is None:
+                return
+            asyncio.run_coroutine_threadsafe(self._session.close(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = None
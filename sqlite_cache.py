@@ -0,0 +1,157 @@
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional
+
+class SQLiteLRUCache:
+    """
+    Base class for persistent SQLite-backed caches.
+    
+    Entries expire after a TTL, and the table is kept under a maximum size by
+    evicting the least recently used rows. Subclasses name the table, its key
+    column and its value columns, and may override ttl_for to vary the TTL per
+    entry and on_hit to keep extra metrics.
+    """
+    
+    table = None
+    key_column = "key"
+    # Value columns and their SQL types, in table order
+    columns = {}
+    created_column = "created_at"
+    
+    def __init__(self, db_path: str, ttl: float, max_entries: int):
+        """
+        Initialize the cache and create its table if needed.
+        
+        Args:
+            db_path: Path of the SQLite file holding the cache
+            ttl: Seconds an entry stays valid
+            max_entries: Maximum number of entries before LRU eviction
+        """
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.init_db()
+    
+    def init_db(self):
+        """Create the cache table and its LRU index."""
+        columns = "".join(f"{name} {sql_type},\n                " for name, sql_type in self.columns.items())
+        with self._lock:
+            self._conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                {self.key_column} TEXT PRIMARY KEY,
+                {columns}{self.created_column} REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            ''')
+            self._conn.execute(f'''
+            CREATE INDEX IF NOT EXISTS idx_{self.table}_last_access
+            ON {self.table} (last_access)
+            ''')
+            self._conn.commit()
+            self._size = self._conn.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+    
+    def ttl_for(self, row: Dict[str, Any]) -> float:
+        """Return the TTL of a stored entry."""
+        return self.ttl
+    
+    def on_hit(self, row: Dict[str, Any]):
+        """Called with the entry on each hit, while the cache lock is held."""
+    
+    def get_row(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an entry, expiring it if its TTL has passed.
+        
+        Args:
+            key: The entry's key
+        
+        Returns:
+            Dictionary of the value columns (and the creation time), or None on a miss
+        """
+        names = list(self.columns) + [self.created_column]
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(f'''
+            SELECT {", ".join(names)}
+            FROM {self.table} WHERE {self.key_column} = ?
+            ''', (key,)).fetchone()
+            
+            if row is not None:
+                row = dict(zip(names, row))
+                if now - row[self.created_column] > self.ttl_for(row):
+                    self._conn.execute(f'DELETE FROM {self.table} WHERE {self.key_column} = ?', (key,))
+                    self._conn.commit()
+                    self._size -= 1
+                    row = None
+            
+            if row is None:
+                self.misses += 1
+                return None
+            
+            self._conn.execute(f'''
+            UPDATE {self.table} SET last_access = ? WHERE {self.key_column} = ?
+            ''', (now, key))
+            self._conn.commit()
+            self.hits += 1
+            self.on_hit(row)
+        return row
+    
+    def put_row(self, key: str, values: Dict[str, Any]):
+        """
+        Store an entry, evicting the least recently used ones beyond max_entries.
+        
+        Args:
+            key: The entry's key
+            values: Value for each value column
+        """
+        now = time.time()
+        names = list(values) + [self.created_column, "last_access"]
+        params = list(values.values()) + [now, now, key]
+        with self._lock:
+            updated = self._conn.execute(f'''
+            UPDATE {self.table}
+            SET {", ".join(f"{name} = ?" for name in names)}
+            WHERE {self.key_column} = ?
+            ''', params).rowcount
+            if not updated:
+                self._conn.execute(f'''
+                INSERT INTO {self.table} ({", ".join(names)}, {self.key_column})
+                VALUES ({", ".join("?" for _ in params)})
+                ''', params)
+                self._size += 1
+            
+            if self._size > self.max_entries:
+                excess = self._size - self.max_entries
+                evicted = self._conn.execute(f'''
+                DELETE FROM {self.table} WHERE {self.key_column} IN (
+                    SELECT {self.key_column} FROM {self.table} ORDER BY last_access ASC LIMIT ?
+                )
+                ''', (excess,)).rowcount
+                self._size -= evicted
+                self.evictions += evicted
+            
+            self._conn.commit()
+    
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._conn.execute(f'DELETE FROM {self.table}')
+            self._conn.commit()
+            self._size = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current cache size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": self._size,
+            "max_entries": self.max_entries
+        }
@@ -0,0 +1,70 @@
+import threading
+import unittest
+
+from claim_cache import ClaimResultCache
+
+
+class GetOrComputeManyTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = ClaimResultCache()
+        self.batches = []
+    
+    def compute_many(self, claims):
+        self.batches.append(list(claims))
+        return [{"claim": claim, "success": True} for claim in claims]
+    
+    def test_only_misses_are_computed(self):
+        self.cache.get_or_compute("Water is wet.", lambda claim: {"claim": claim, "success": True})
+        results = self.cache.get_or_compute_many(["water is wet", "Fire is hot", "fire is HOT!"],
+                                                 self.compute_many)
+        self.assertEqual(self.batches, [["Fire is hot"]])
+        self.assertEqual([cached for _, cached in results], [True, False, True])
+        self.assertEqual(results[2][0], {"claim": "Fire is hot", "success": True})
+    
+    def test_results_are_reused_by_later_calls(self):
+        self.cache.get_or_compute_many(["a claim", "another claim"], self.compute_many)
+        results = self.cache.get_or_compute_many(["another claim", "a third claim"], self.compute_many)
+        self.assertEqual(self.batches, [["a claim", "another claim"], ["a third claim"]])
+        self.assertEqual([cached for _, cached in results], [True, False])
+    
+    def test_uncacheable_results_are_not_stored(self):
+        self.cache.get_or_compute_many(["a claim"], lambda claims: [{"success": False} for _ in claims],
+                                       cacheable=lambda result: result["success"])
+        self.cache.get_or_compute_many(["a claim"], self.compute_many)
+        self.assertEqual(self.batches, [["a claim"]])
+    
+    def test_concurrent_calls_share_in_flight_claims(self):
+        started = threading.Event()
+        release = threading.Event()
+        
+        def slow_compute_many(claims):
+            started.set()
+            release.wait(5)
+            return self.compute_many(claims)
+        
+        first = threading.Thread(target=self.cache.get_or_compute_many, args=(["shared claim"], slow_compute_many))
+        first.start()
+        started.wait(5)
+        second = []
+        waiter = threading.Thread(target=lambda: second.extend(
+            self.cache.get_or_compute_many(["Shared claim.", "own claim"], self.compute_many)))
+        waiter.start()
+        release.set()
+        first.join(5)
+        waiter.join(5)
+        
+        self.assertEqual(sorted(self.batches), [["own claim"], ["shared claim"]])
+        self.assertEqual([cached for _, cached in second], [True, False])
+    
+    def test_failed_computation_releases_waiters(self):
+        def fail(claims):
+            raise RuntimeError("verification failed")
+        
+        with self.assertRaises(RuntimeError):
+            self.cache.get_or_compute_many(["a claim"], fail)
+        self.assertEqual(self.cache.get_or_compute_many(["a claim"], self.compute_many)[0][1], False)
+        self.assertEqual(self.cache.stats()["size"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+
+from claim_detector import COPULA_WEIGHT, DEFAULT_MIN_STRENGTH, ClaimDetector
+
+INDICATORS = ['is', 'are', 'was', 'were', 'shows', 'never', 'according to', 'studies show']
+
+
+class ClaimDetectorTest(unittest.TestCase):
+    def setUp(self):
+        self.detector = ClaimDetector(INDICATORS)
+    
+    def test_default_threshold_is_above_a_copula(self):
+        self.assertGreater(DEFAULT_MIN_STRENGTH, COPULA_WEIGHT)
+        self.assertEqual(self.detector.min_strength, DEFAULT_MIN_STRENGTH)
+    
+    def test_copulas_alone_are_not_claims(self):
+        for sentence in ("The weather is nice today.", "They were at home and it was late, as it is."):
+            self.assertIsNone(self.detector.detect_claim(sentence))
+    
+    def test_non_copula_indicator_is_a_claim(self):
+        detection = self.detector.detect_claim("The report shows that costs are rising.")
+        self.assertEqual(detection["indicators"], ["shows", "are"])
+        self.assertIsNotNone(self.detector.detect_claim("Vaccines never cause autism."))
+        self.assertIsNotNone(self.detector.detect_claim("According to the survey, turnout rose."))
+    
+    def test_short_sentences_are_not_claims(self):
+        self.assertIsNone(self.detector.detect_claim("Studies show."))
+    
+    def test_indicators_match_whole_words_only(self):
+        self.assertEqual(self.detector.detect("This island shows nevertheless")["indicators"], ["shows"])
+    
+    def test_explicit_zero_threshold_keeps_copula_sentences(self):
+        detector = ClaimDetector(INDICATORS, min_strength=0.0)
+        self.assertIsNotNone(detector.detect_claim("The weather is nice today."))
+
+
+if __name__ == "__main__":
+    unittest.main()
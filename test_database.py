@@ -0,0 +1,292 @@
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+import database
+from database import Database, MIGRATIONS
+
+# Tables as created by the schema before any migration existed
+BASELINE_SCHEMA = [
+    '''CREATE TABLE analyses (
+           id INTEGER PRIMARY KEY AUTOINCREMENT,
+           text TEXT NOT NULL,
+           analysis_type TEXT NOT NULL,
+           results TEXT NOT NULL,
+           created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+           source TEXT,
+           confidence_score REAL
+       )''',
+    '''CREATE TABLE claims (
+           id INTEGER PRIMARY KEY AUTOINCREMENT,
+           analysis_id INTEGER,
+           claim_text TEXT NOT NULL,
+           verification_status TEXT,
+           verification_source TEXT,
+           confidence_score REAL,
+           FOREIGN KEY (analysis_id) REFERENCES analyses (id)
+       )''',
+]
+
+
+def create_baseline_db(path, claims=0):
+    conn = sqlite3.connect(path)
+    for statement in BASELINE_SCHEMA:
+        conn.execute(statement)
+    conn.execute("INSERT INTO analyses (text, analysis_type, results) VALUES ('text', 'general', '{}')")
+    conn.executemany("INSERT INTO claims (analysis_id, claim_text) VALUES (1, ?)",
+                     [(f"Claim number {i}.",) for i in range(claims)])
+    conn.commit()
+    conn.close()
+
+
+def open_database(path, results):
+    try:
+        Database(path).close()
+        results.put(None)
+    except Exception as e:
+        results.put(repr(e))
+
+
+class DatabaseTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'test.db')
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+    
+    def user_version(self):
+        conn = sqlite3.connect(self.path)
+        try:
+            return conn.execute('PRAGMA user_version').fetchone()[0]
+        finally:
+            conn.close()
+
+
+class MigrationTest(DatabaseTestCase):
+    def test_concurrent_startup_migrates_once(self):
+        create_baseline_db(self.path, claims=2000)
+        results = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=open_database, args=(self.path, results))
+                     for _ in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.assertEqual([results.get() for _ in processes], [None] * len(processes))
+        self.assertEqual(self.user_version(), len(MIGRATIONS))
+    
+    def test_failed_migration_rolls_back(self):
+        create_baseline_db(self.path, claims=10)
+        
+        def fail(conn):
+            raise RuntimeError("migration failed")
+        
+        original = MIGRATIONS[3]
+        MIGRATIONS[3] = original + [fail]
+        try:
+            with self.assertRaises(RuntimeError):
+                Database(self.path)
+        finally:
+            MIGRATIONS[3] = original
+        self.assertEqual(self.user_version(), 3)
+        
+        db = Database(self.path)
+        with db.connection() as conn:
+            missing = conn.execute('SELECT COUNT(*) FROM claims WHERE fingerprint IS NULL').fetchone()[0]
+        db.close()
+        self.assertEqual(missing, 0)
+        self.assertEqual(self.user_version(), len(MIGRATIONS))
+    
+    def test_fingerprint_column_added_before_interrupted_upgrade(self):
+        create_baseline_db(self.path, claims=10)
+        conn = sqlite3.connect(self.path)
+        for statements in MIGRATIONS[:3]:
+            for statement in statements:
+                conn.execute(statement)
+        conn.execute('ALTER TABLE claims ADD COLUMN fingerprint TEXT')
+        conn.execute('PRAGMA user_version = 3')
+        conn.commit()
+        conn.close()
+        
+        db = Database(self.path)
+        with db.connection() as conn:
+            missing = conn.execute('SELECT COUNT(*) FROM claims WHERE fingerprint IS NULL').fetchone()[0]
+        db.close()
+        self.assertEqual(missing, 0)
+        self.assertEqual(self.user_version(), len(MIGRATIONS))
+
+
+class ArchiveStatsTest(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.db = Database(self.path)
+        self.ids = [self.db.save_analysis(f"text {i}", 'general',
+                                          {'claims': [{'text': f"claim {i}", 'status': 'true'}]},
+                                          confidence_score=0.5)
+                    for i in range(12)]
+        with self.db.connection() as conn:
+            # The first eight analyses go to two old months, the rest stay recent
+            for i, analysis_id in enumerate(self.ids[:8]):
+                month = '2020-01' if i < 4 else '2020-02'
+                conn.execute("UPDATE analyses SET created_at = ? WHERE id = ?",
+                             (f'{month}-0{i % 4 + 1} 12:00:00', analysis_id))
+            conn.commit()
+        self.db.rebuild_stats()
+    
+    def tearDown(self):
+        self.db.close()
+        super().tearDown()
+    
+    def test_archive_moves_old_months(self):
+        self.assertEqual(self.db.archive_analyses(30), {'2020-01': 4, '2020-02': 4})
+        with self.db.connection() as conn:
+            self.assertEqual(conn.execute('SELECT COUNT(*) FROM analyses').fetchone()[0], 4)
+        self.assertEqual(sorted(os.listdir(self.db.archive_dir)),
+                         ['analyses-2020-01.db', 'analyses-2020-02.db'])
+        self.assertEqual(self.db.get_analysis(self.ids[0])['text'], "text 0")
+    
+    def test_rebuild_stats_includes_archived_days(self):
+        before = self.db.get_stats()
+        self.assertEqual(before['totals']['general']['analyses'], 12)
+        self.db.archive_analyses(30)
+        self.db.rebuild_stats()
+        after = self.db.get_stats()
+        self.assertEqual(after, before)
+        self.assertEqual(self.db.get_stats(start='2020-01-01', end='2020-01-31')['totals']['general']['claims'], 4)
+
+
+class ExportTest(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.db = Database(self.path)
+        self.ids = [self.db.save_analysis(f"text {i}", 'general', {'claims': [{'text': f"claim {i}"}]})
+                    for i in range(10)]
+    
+    def tearDown(self):
+        self.db.close()
+        super().tearDown()
+    
+    def test_pages_cover_every_analysis_in_order(self):
+        for page_size in (1, 3, 10, 50):
+            analyses = list(self.db.iter_analyses(page_size=page_size))
+            self.assertEqual([analysis['id'] for analysis in analyses], self.ids)
+            self.assertEqual([analysis['claims'][0]['text'] for analysis in analyses],
+                             [f"claim {i}" for i in range(10)])
+    
+    def test_since_id_resumes_after_last_exported(self):
+        self.assertEqual([analysis['id'] for analysis in self.db.iter_analyses(self.ids[6], page_size=2)],
+                         self.ids[7:])
+    
+    def test_includes_archived_analyses(self):
+        with self.db.connection() as conn:
+            conn.executemany("UPDATE analyses SET created_at = '2020-01-15 00:00:00' WHERE id = ?",
+                             [(analysis_id,) for analysis_id in self.ids[2:5]])
+            conn.commit()
+        self.db.archive_analyses(30)
+        self.assertEqual([analysis['id'] for analysis in self.db.iter_analyses(page_size=2)], self.ids)
+    
+    def test_rejects_page_size_below_one(self):
+        for page_size in (0, -1):
+            with self.assertRaises(ValueError):
+                self.db.iter_analyses(page_size=page_size)
+
+
+class RecentAnalysesTest(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.db = Database(self.path)
+        self.ids = [self.db.save_analysis(f"text {i}", 'general', {'claims': []}) for i in range(9)]
+        with self.db.connection() as conn:
+            # Several analyses share a timestamp, so paging must break ties on id
+            conn.executemany("UPDATE analyses SET created_at = ? WHERE id = ?",
+                             [(f'2030-01-0{i // 3 + 1} 00:00:00', analysis_id)
+                              for i, analysis_id in enumerate(self.ids)])
+            conn.commit()
+    
+    def tearDown(self):
+        self.db.close()
+        super().tearDown()
+    
+    def page_through(self, limit, summary=False):
+        seen = []
+        before_ts = before_id = None
+        while True:
+            page = self.db.get_recent_analyses(limit=limit, before_id=before_id, before_ts=before_ts,
+                                               summary=summary)
+            if not page:
+                return seen
+            seen += [analysis['id'] for analysis in page]
+            before_ts, before_id = page[-1]['created_at'], page[-1]['id']
+    
+    def test_keyset_pages_are_newest_first_without_gaps(self):
+        for limit in (1, 2, 4, 9):
+            self.assertEqual(self.page_through(limit), self.ids[::-1])
+            self.assertEqual(self.page_through(limit, summary=True), self.ids[::-1])
+    
+    def test_before_id_alone_looks_up_its_timestamp(self):
+        self.assertEqual([analysis['id'] for analysis in self.db.get_recent_analyses(limit=3, before_id=self.ids[4])],
+                         [self.ids[3], self.ids[2], self.ids[1]])
+    
+    def test_summary_skips_results(self):
+        analysis = self.db.get_recent_analyses(limit=1, summary=True)[0]
+        self.assertNotIn('results', analysis)
+        self.assertEqual(analysis['id'], self.ids[-1])
+
+
+class WriteBehindTest(DatabaseTestCase):
+    def test_queued_analyses_are_committed_with_reserved_ids(self):
+        db = Database(self.path, write_behind=True, batch_size=4, flush_interval_ms=10)
+        try:
+            ids = [db.save_analysis(f"text {i}", 'general', {'claims': [{'text': f"claim {i}"}]})
+                   for i in range(10)]
+            self.assertEqual(ids, list(range(ids[0], ids[0] + 10)))
+            db.flush()
+            self.assertEqual([analysis['text'] for analysis in db.get_analyses(ids)],
+                             [f"text {i}" for i in range(10)])
+            self.assertEqual(db.get_stats()['totals']['general']['claims'], 10)
+        finally:
+            db.close()
+    
+    def test_close_drains_the_queue(self):
+        db = Database(self.path, write_behind=True, flush_interval_ms=1000)
+        analysis_id = db.save_analysis("text", 'general', {})
+        db.close()
+        db = Database(self.path)
+        try:
+            self.assertEqual(db.get_analysis(analysis_id)['text'], "text")
+        finally:
+            db.close()
+
+
+class CompressionTest(DatabaseTestCase):
+    def test_plain_json_rows_are_compressed_in_place(self):
+        db = Database(self.path, compress_results=False)
+        try:
+            ids = [db.save_analysis(f"text {i}", 'general', {'claims': [], 'n': i}) for i in range(5)]
+            with db.connection() as conn:
+                self.assertEqual(conn.execute("SELECT COUNT(*) FROM analyses WHERE typeof(results) = 'text'")
+                                 .fetchone()[0], 5)
+            self.assertEqual(db.compress_existing_results(batch_size=2), 5)
+            self.assertEqual(db.compress_existing_results(), 0)
+            with db.connection() as conn:
+                self.assertEqual(conn.execute("SELECT COUNT(*) FROM analyses WHERE typeof(results) = 'blob'")
+                                 .fetchone()[0], 5)
+            self.assertEqual([dict(db.get_analysis(analysis_id)['results'])['n'] for analysis_id in ids],
+                             list(range(5)))
+        finally:
+            db.close()
+    
+    def test_both_formats_decode(self):
+        results = {'claims': [{'text': "claim", 'status': 'true'}]}
+        self.assertEqual(database.decode_results(database.encode_results(results)), results)
+        self.assertEqual(database.decode_results(database.encode_results(results, compress=False)), results)
+        with self.assertRaises(ValueError):
+            database.decode_results(b'\x7fnot a known format')
+
+
+if __name__ == "__main__":
+    unittest.main()
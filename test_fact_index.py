@@ -0,0 +1,41 @@
+import unittest
+
+import fact_checker
+from fact_checker import KNOWN_FACTS, add_known_topic, register_fact_index
+from fact_index import FactIndex
+
+
+class AddKnownTopicIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.known_facts = dict(KNOWN_FACTS)
+        self.indexes = list(fact_checker._KNOWN_FACTS_INDEXES)
+        self.index = FactIndex()
+        register_fact_index(self.index)
+    
+    def tearDown(self):
+        KNOWN_FACTS.clear()
+        KNOWN_FACTS.update(self.known_facts)
+        fact_checker._KNOWN_FACTS_INDEXES[:] = self.indexes
+    
+    def test_registering_indexes_existing_topics(self):
+        self.assertEqual(len(self.index), sum(len(data.get("facts", [])) for data in KNOWN_FACTS.values()))
+    
+    def test_added_topic_is_searchable(self):
+        add_known_topic("Ocean Acidification", {
+            "facts": ["Seawater pH has dropped by about 0.1 since preindustrial times."],
+            "sources": [],
+            "counter_arguments": []
+        })
+        results = self.index.search("seawater pH dropped", topic="ocean acidification")
+        self.assertEqual([r["fact"] for r in results],
+                         ["Seawater pH has dropped by about 0.1 since preindustrial times."])
+    
+    def test_replaced_topic_drops_old_facts(self):
+        add_known_topic("ocean acidification", {"facts": ["Seawater pH has dropped."]})
+        add_known_topic("ocean acidification", {"facts": ["Coral reefs dissolve faster in acidic water."]})
+        self.assertEqual(self.index.search("seawater pH"), [])
+        self.assertEqual(len(self.index.search("coral reefs acidic")), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import json
+import unittest
+
+from gpt_analyzer import GPTAnalyzer
+
+
+class BatchVerdictTest(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = GPTAnalyzer(cache_path=None)
+    
+    def parse(self, items, count=3):
+        return self.analyzer._parse_batch_verdicts("Verdicts:\n" + json.dumps(items) + "\nDone.", count)
+    
+    def test_repeated_index_keeps_first_verdict(self):
+        verdicts = self.parse([
+            {"index": 0, "status": "true"},
+            {"index": 0, "status": "false"},
+            {"index": "1", "status": "inconclusive"}
+        ])
+        self.assertEqual(verdicts, {0: {"status": "true"}, 1: {"status": "inconclusive"}})
+    
+    def test_invalid_items_are_dropped(self):
+        verdicts = self.parse([
+            "not an object",
+            {"index": 3, "status": "true"},
+            {"index": -1, "status": "true"},
+            {"index": True, "status": "true"},
+            {"index": 1},
+            {"index": 1, "status": "false", "confidence": 0.9}
+        ])
+        self.assertEqual(verdicts, {1: {"status": "false", "confidence": 0.9}})
+    
+    def test_malformed_reply_yields_no_verdicts(self):
+        for response in ("no array here", "[{\"index\": 0, \"status\": ", "{\"index\": 0, \"status\": \"true\"}"):
+            self.assertEqual(self.analyzer._parse_batch_verdicts(response, 2), {})
+    
+    def test_dropped_claims_are_verified_individually(self):
+        reply = json.dumps([{"index": 0, "status": "true"}, {"index": 0, "status": "false"}])
+        individually = []
+        self.analyzer.use_gpt = True
+        self.analyzer._chat_completion = lambda **kwargs: (reply, False)
+        self.analyzer.verify_claim = lambda claim, bypass_cache=False: individually.append(claim) or {"claim": claim}
+        
+        results = self.analyzer.verify_claims(["first", "second"])
+        
+        self.assertEqual(results[0]["verification"], {"status": "true"})
+        self.assertTrue(results[0]["batched"])
+        self.assertEqual(results[1], {"claim": "second"})
+        self.assertEqual(individually, ["second"])
+
+
+if __name__ == "__main__":
+    unittest.main()
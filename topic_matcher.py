@@ -0,0 +1,116 @@
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+class TopicMatcher:
+    """
+    An Aho-Corasick automaton that finds every known topic in a text in one pass.
+    
+    Matching is case-insensitive and only accepts whole-word occurrences. When
+    matches overlap, the longest one wins, and among those the leftmost.
+    """
+    
+    def __init__(self, topics: Iterable[str]):
+        """
+        Compile the automaton for a set of topics.
+        
+        Args:
+            topics: The topic strings to match
+        """
+        self.topics = sorted({topic for topic in topics if topic})
+        # Lengths after case folding, which can differ from the original length
+        self._lengths = [len(topic.lower()) for topic in self.topics]
+        
+        # State 0 is the root; each state has its transitions, failure link and outputs
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        
+        for topic_id, topic in enumerate(self.topics):
+            state = 0
+            for char in topic.lower():
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(topic_id)
+        
+        # Breadth-first pass to set failure links and merge outputs along them
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+    
+    def __len__(self) -> int:
+        return len(self.topics)
+    
+    def find_all(self, text: str) -> List[Tuple[str, int, int]]:
+        """
+        Find all non-overlapping whole-word topic occurrences in a text.
+        
+        Args:
+            text: The text to scan
+        
+        Returns:
+            List of (topic, start, end) tuples in order of appearance, with
+            start and end as offsets into the original text
+        """
+        # Fold case one character at a time, since lowercasing can change the
+        # length (e.g. "İ" becomes two characters); origin maps each folded
+        # character back to the index of the character it came from
+        folded = []
+        origin = []
+        for index, char in enumerate(text):
+            lowered = char.lower()
+            folded.extend(lowered)
+            origin.extend([index] * len(lowered))
+        
+        candidates = []
+        state = 0
+        for position, char in enumerate(folded):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for topic_id in self._output[state]:
+                end = position + 1
+                start = end - self._lengths[topic_id]
+                if start > 0 and (_is_word_char(folded[start - 1]) or origin[start - 1] == origin[start]):
+                    continue
+                if end < len(folded) and (_is_word_char(folded[end]) or origin[end] == origin[end - 1]):
+                    continue
+                candidates.append((origin[start], origin[end - 1] + 1, topic_id))
+        
+        # Resolve overlaps: longest first, leftmost among equal lengths
+        candidates.sort(key=lambda match: (match[0] - match[1], match[0]))
+        taken = bytearray(len(text))
+        matches = []
+        for start, end, topic_id in candidates:
+            if not any(taken[start:end]):
+                taken[start:end] = b'\x01' * (end - start)
+                matches.append((self.topics[topic_id], start, end))
+        matches.sort(key=lambda match: match[1])
+        return matches
+    
+    def best_match(self, text: str):
+        """
+        Return the longest topic found in a text, or None if there is none.
+        
+        Args:
+            text: The text to scan
+        """
+        matches = self.find_all(text)
+        if not matches:
+            return None
+        return max(matches, key=lambda match: match[2] - match[1])[0]
@@ -0,0 +1,72 @@
+from typing import Dict, Any, Optional
+from sqlite_cache import SQLiteLRUCache
+
+class WikipediaCache(SQLiteLRUCache):
+    """
+    A persistent SQLite-backed cache for Wikipedia page lookups.
+    
+    Entries expire after a TTL (shorter for pages that don't exist), and the
+    table is kept under a maximum size by evicting the least recently used rows.
+    """
+    
+    table = "wikipedia_cache"
+    key_column = "title"
+    columns = {
+        "page_exists": "INTEGER NOT NULL",
+        "page_title": "TEXT",
+        "url": "TEXT",
+        "summary": "TEXT"
+    }
+    created_column = "fetched_at"
+    
+    def __init__(self, db_path: str = "wikipedia_cache.db", ttl: float = 7 * 24 * 3600,
+                 negative_ttl: float = 24 * 3600, max_entries: int = 50000):
+        """
+        Initialize the cache and create its table if needed.
+        
+        Args:
+            db_path: Path of the SQLite file holding the cache
+            ttl: Seconds a cached page summary stays valid
+            negative_ttl: Seconds a "page does not exist" entry stays valid
+            max_entries: Maximum number of cached pages before LRU eviction
+        """
+        self.negative_ttl = negative_ttl
+        super().__init__(db_path, ttl, max_entries)
+    
+    def ttl_for(self, row: Dict[str, Any]) -> float:
+        return self.ttl if row["page_exists"] else self.negative_ttl
+    
+    def get(self, title: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached page.
+        
+        Args:
+            title: The title that was requested from Wikipedia
+        
+        Returns:
+            Dictionary with exists, title, url and summary, or None on a miss
+        """
+        row = self.get_row(title)
+        if row is None:
+            return None
+        return {
+            "exists": bool(row["page_exists"]),
+            "title": row["page_title"],
+            "url": row["url"],
+            "summary": row["summary"]
+        }
+    
+    def put(self, title: str, page: Dict[str, Any]):
+        """
+        Store a page lookup, including lookups for pages that don't exist.
+        
+        Args:
+            title: The title that was requested from Wikipedia
+            page: Dictionary with exists, title, url and summary
+        """
+        self.put_row(title, {
+            "page_exists": int(bool(page.get("exists"))),
+            "page_title": page.get("title"),
+            "url": page.get("url"),
+            "summary": page.get("summary")
+        })
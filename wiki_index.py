@@ -0,0 +1,184 @@
+import argparse
+import json
+import mmap
+import struct
+import sys
+from typing import Dict, Any, Optional
+from urllib.parse import quote
+
+# File layout:
+#   header  - magic, record count, offset of the index
+#   records - key, title and summary bytes for every article, sorted by key
+#   index   - one fixed-size entry per record, in the same sorted order
+MAGIC = b'DSWIKI01'
+HEADER = struct.Struct('<8sQQ')
+INDEX_ENTRY = struct.Struct('<QHHI')  # record offset, key length, title length, summary length
+
+def normalize_title(title: str) -> str:
+    """Normalize a title into the lookup key used by the index."""
+    return ' '.join(title.replace('_', ' ').split()).casefold()
+
+def page_url(title: str, language: str = 'en') -> str:
+    """Build the Wikipedia URL of an article title."""
+    return f"https://{language}.wikipedia.org/wiki/{quote(title.replace(' ', '_'))}"
+
+class LocalWikipediaIndex:
+    """
+    A read-only, memory-mapped index of Wikipedia article summaries.
+    
+    Titles are resolved with a binary search over a sorted, fixed-width index,
+    so lookups never touch the network and only page in the bytes they read.
+    """
+    
+    def __init__(self, index_path: str, language: str = 'en'):
+        """
+        Open an index file built by build_index.
+        
+        Args:
+            index_path: Path of the index file
+            language: Wikipedia language used to build article URLs
+        """
+        self.index_path = index_path
+        self.language = language
+        self._file = open(index_path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        magic, self.count, self._index_offset = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{index_path} is not a Wikipedia summary index")
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def _entry(self, position: int):
+        return INDEX_ENTRY.unpack_from(self._mm, self._index_offset + position * INDEX_ENTRY.size)
+    
+    def lookup(self, title: str) -> Optional[Dict[str, Any]]:
+        """
+        Resolve a title to its article summary.
+        
+        Args:
+            title: The article title to look up (case and underscores are ignored)
+        
+        Returns:
+            Dictionary with exists, title, url and summary, or None if not indexed
+        """
+        key = normalize_title(title).encode('utf-8')
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            offset, key_len, title_len, summary_len = self._entry(middle)
+            candidate = self._mm[offset:offset + key_len]
+            if candidate < key:
+                low = middle + 1
+            elif candidate > key:
+                high = middle
+            else:
+                title_start = offset + key_len
+                summary_start = title_start + title_len
+                page_title = self._mm[title_start:summary_start].decode('utf-8')
+                return {
+                    "exists": True,
+                    "title": page_title,
+                    "url": page_url(page_title, self.language),
+                    "summary": self._mm[summary_start:summary_start + summary_len].decode('utf-8')
+                }
+        return None
+    
+    def close(self):
+        """Release the memory map and the underlying file."""
+        self._mm.close()
+        self._file.close()
+
+def build_index(dump_path: str, index_path: str, title_field: str = 'title',
+                summary_field: str = 'summary') -> int:
+    """
+    Build a summary index from a JSONL dump with one article per line.
+    
+    Only the keys and line offsets are held in memory while sorting; article
+    text is streamed from the dump straight into the index file.
+    
+    Args:
+        dump_path: Path of the JSONL dump
+        index_path: Path of the index file to write
+        title_field: JSON field holding the article title
+        summary_field: JSON field holding the article summary
+    
+    Returns:
+        Number of articles written to the index
+    """
+    # First pass: collect the sort key and line offset of every usable article
+    keys = {}
+    with open(dump_path, 'rb') as dump:
+        offset = dump.tell()
+        for line in iter(dump.readline, b''):
+            if line.strip():
+                article = json.loads(line)
+                title = article.get(title_field)
+                if title and article.get(summary_field):
+                    key = normalize_title(title).encode('utf-8')
+                    # Keep the first occurrence of a title
+                    keys.setdefault(key, offset)
+            offset = dump.tell()
+    
+    ordered = sorted(keys.items())
+    
+    # Second pass: write records in key order, then the index behind them
+    entries = []
+    with open(dump_path, 'rb') as dump, open(index_path, 'wb') as out:
+        out.write(HEADER.pack(MAGIC, 0, 0))
+        for key, line_offset in ordered:
+            dump.seek(line_offset)
+            article = json.loads(dump.readline())
+            title = article[title_field].encode('utf-8')
+            summary = article[summary_field].encode('utf-8')
+            if len(key) > 0xFFFF or len(title) > 0xFFFF:
+                continue
+            entries.append(INDEX_ENTRY.pack(out.tell(), len(key), len(title), len(summary)))
+            out.write(key)
+            out.write(title)
+            out.write(summary)
+        
+        index_offset = out.tell()
+        for entry in entries:
+            out.write(entry)
+        out.seek(0)
+        out.write(HEADER.pack(MAGIC, len(entries), index_offset))
+    
+    return len(entries)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query the local Wikipedia summary index.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    build_parser = subparsers.add_parser('build', help="Build an index from a JSONL dump")
+    build_parser.add_argument('dump', help="JSONL file with one article per line")
+    build_parser.add_argument('index', help="Path of the index file to write")
+    build_parser.add_argument('--title-field', default='title')
+    build_parser.add_argument('--summary-field', default='summary')
+    
+    lookup_parser = subparsers.add_parser('lookup', help="Look up a title in an index")
+    lookup_parser.add_argument('index', help="Path of the index file")
+    lookup_parser.add_argument('title', help="Article title to look up")
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == 'build':
+        count = build_index(args.dump, args.index, args.title_field, args.summary_field)
+        print(f"Indexed {count} articles into {args.index}")
+        return 0
+    
+    index = LocalWikipediaIndex(args.index)
+    try:
+        page = index.lookup(args.title)
+    finally:
+        index.close()
+    if page is None:
+        print(f"No article found for '{args.title}'", file=sys.stderr)
+        return 1
+    print(json.dumps(page, indent=2, ensure_ascii=False))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())